@@ -1,56 +1,44 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from typing import List, Optional
 
 from app.db.database import get_conn
 from app.models.dictionary import Dictionary
 
+# Column order matches Dictionary's fields; rows are built with Dictionary(*row).
+_DICT_COLS = "id, name, folder, mdx_filename, css_filename, cover_filename, created_at"
+_SQL_LIST_DICTS = f"""SELECT {_DICT_COLS}
+                     FROM dictionaries ORDER BY name ASC
+                     LIMIT ? OFFSET ?"""
+_SQL_GET_DICT = f"""SELECT {_DICT_COLS}
+                     FROM dictionaries WHERE id = ?"""
+_SQL_INSERT_DICT = f"""INSERT INTO dictionaries (name, folder, mdx_filename, css_filename, cover_filename, created_at)
+                     VALUES (?, ?, ?, ?, ?, strftime('%s', 'now'))
+                     RETURNING {_DICT_COLS}"""
+_SQL_DELETE_DICT = "DELETE FROM dictionaries WHERE id = ?"
+
 class DictRepo:
-    def list_dicts(self) -> List[Dictionary]:
-        with get_conn() as conn:
-            rows = conn.execute(
-                """SELECT id, name, folder, mdx_filename, css_filename, cover_filename, created_at
-                     FROM dictionaries ORDER BY name ASC"""
-            ).fetchall()
-        return [Dictionary(
-            id=r["id"], name=r["name"], folder=r["folder"], mdx_filename=r["mdx_filename"],
-            css_filename=r["css_filename"], cover_filename=r["cover_filename"], created_at=r["created_at"]
-        ) for r in rows]
+    def list_dicts(self, limit: int | None = None, offset: int = 0) -> List[Dictionary]:
+        # SQLite treats LIMIT -1 as "no limit".
+        with get_conn(readonly=True) as conn:
+            rows = conn.execute(_SQL_LIST_DICTS, (-1 if limit is None else limit, offset)).fetchall()
+        return [Dictionary(*r) for r in rows]
 
     def get_by_id(self, dict_id: int) -> Optional[Dictionary]:
-        with get_conn() as conn:
-            r = conn.execute(
-                """SELECT id, name, folder, mdx_filename, css_filename, cover_filename, created_at
-                     FROM dictionaries WHERE id = ?""",
-                (dict_id,),
-            ).fetchone()
+        with get_conn(readonly=True) as conn:
+            r = conn.execute(_SQL_GET_DICT, (dict_id,)).fetchone()
         if not r:
             return None
-        return Dictionary(
-            id=r["id"], name=r["name"], folder=r["folder"], mdx_filename=r["mdx_filename"],
-            css_filename=r["css_filename"], cover_filename=r["cover_filename"], created_at=r["created_at"]
-        )
+        return Dictionary(*r)
 
     def create(self, name: str, folder: str, mdx_filename: str, css_filename: str | None, cover_filename: str | None) -> Dictionary:
-        now = datetime.now(timezone.utc).isoformat()
         with get_conn() as conn:
-            cur = conn.execute(
-                """INSERT INTO dictionaries (name, folder, mdx_filename, css_filename, cover_filename, created_at)
-                     VALUES (?, ?, ?, ?, ?, ?)""",
-                (name, folder, mdx_filename, css_filename, cover_filename, now),
-            )
-            dict_id = int(cur.lastrowid)
             r = conn.execute(
-                """SELECT id, name, folder, mdx_filename, css_filename, cover_filename, created_at
-                     FROM dictionaries WHERE id = ?""",
-                (dict_id,),
+                _SQL_INSERT_DICT,
+                (name, folder, mdx_filename, css_filename, cover_filename),
             ).fetchone()
-        return Dictionary(
-            id=r["id"], name=r["name"], folder=r["folder"], mdx_filename=r["mdx_filename"],
-            css_filename=r["css_filename"], cover_filename=r["cover_filename"], created_at=r["created_at"]
-        )
+        return Dictionary(*r)
 
     def delete(self, dict_id: int) -> None:
         with get_conn() as conn:
-            conn.execute("DELETE FROM dictionaries WHERE id = ?", (dict_id,))
+            conn.execute(_SQL_DELETE_DICT, (dict_id,))
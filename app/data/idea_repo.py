@@ -1,40 +1,41 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
 from typing import List, Optional
 
 from app.db.database import get_conn
 from app.models.idea import Idea
 
-class IdeaRepo:
-    def list_by_user(self, user_id: int) -> List[Idea]:
-        with get_conn() as conn:
-            rows = conn.execute(
-                """SELECT id, user_id, title, details, created_at
+# Column order matches Idea's fields; rows are built with Idea(*row).
+_IDEA_COLS = "id, user_id, title, details, created_at"
+_SQL_LIST_IDEAS_BY_USER = f"""SELECT {_IDEA_COLS}
                      FROM ideas WHERE user_id = ?
-                     ORDER BY id DESC""",
-                (user_id,),
-            ).fetchall()
-        return [Idea(id=r["id"], user_id=r["user_id"], title=r["title"], details=r["details"], created_at=r["created_at"]) for r in rows]
+                     ORDER BY id DESC
+                     LIMIT ? OFFSET ?"""
+_SQL_INSERT_IDEA = f"""INSERT INTO ideas (user_id, title, details, created_at)
+                     VALUES (?, ?, ?, strftime('%s', 'now'))
+                     RETURNING {_IDEA_COLS}"""
+_SQL_GET_IDEA = f"SELECT {_IDEA_COLS} FROM ideas WHERE id = ?"
+_SQL_DELETE_IDEA = "DELETE FROM ideas WHERE id = ?"
+
+class IdeaRepo:
+    def list_by_user(self, user_id: int, limit: int | None = None, offset: int = 0) -> List[Idea]:
+        # SQLite treats LIMIT -1 as "no limit".
+        with get_conn(readonly=True) as conn:
+            rows = conn.execute(_SQL_LIST_IDEAS_BY_USER, (user_id, -1 if limit is None else limit, offset)).fetchall()
+        return [Idea(*r) for r in rows]
 
     def create(self, user_id: int, title: str, details: str) -> Idea:
-        now = datetime.now(timezone.utc).isoformat()
         with get_conn() as conn:
-            cur = conn.execute(
-                "INSERT INTO ideas (user_id, title, details, created_at) VALUES (?, ?, ?, ?)",
-                (user_id, title, details, now),
-            )
-            idea_id = int(cur.lastrowid)
-            row = conn.execute("SELECT id, user_id, title, details, created_at FROM ideas WHERE id = ?", (idea_id,)).fetchone()
-        return Idea(id=row["id"], user_id=row["user_id"], title=row["title"], details=row["details"], created_at=row["created_at"])
+            row = conn.execute(_SQL_INSERT_IDEA, (user_id, title, details)).fetchone()
+        return Idea(*row)
 
     def get_by_id(self, idea_id: int) -> Optional[Idea]:
-        with get_conn() as conn:
-            row = conn.execute("SELECT id, user_id, title, details, created_at FROM ideas WHERE id = ?", (idea_id,)).fetchone()
+        with get_conn(readonly=True) as conn:
+            row = conn.execute(_SQL_GET_IDEA, (idea_id,)).fetchone()
         if not row:
             return None
-        return Idea(id=row["id"], user_id=row["user_id"], title=row["title"], details=row["details"], created_at=row["created_at"])
+        return Idea(*row)
 
     def delete(self, idea_id: int) -> None:
         with get_conn() as conn:
-            conn.execute("DELETE FROM ideas WHERE id = ?", (idea_id,))
+            conn.execute(_SQL_DELETE_IDEA, (idea_id,))
@@ -1,34 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from app.db.database import get_conn
+from app.db.database import fetch_scalar, get_conn
+
+_SQL_INSERT_SESSION = """INSERT INTO sessions (token, user_id, created_at, expires_at)
+                     VALUES (?, ?, strftime('%s', 'now'), strftime('%s', 'now') + ?)"""
+# Expired rows simply don't match, so no timestamp parsing happens in Python.
+_SQL_GET_SESSION_USER_ID = """SELECT user_id FROM sessions
+                     WHERE token = ? AND expires_at > strftime('%s', 'now')"""
+_SQL_DELETE_SESSION = "DELETE FROM sessions WHERE token = ?"
+_SQL_PURGE_EXPIRED_SESSIONS = "DELETE FROM sessions WHERE expires_at <= strftime('%s', 'now')"
 
 class SessionRepo:
     SESSION_LIFETIME_HOURS = 24
 
     def create_session(self, user_id: int, token: str) -> None:
-        now = datetime.now(timezone.utc)
-        expires = now + timedelta(hours=self.SESSION_LIFETIME_HOURS)
         with get_conn() as conn:
-            conn.execute(
-                """INSERT INTO sessions (token, user_id, created_at, expires_at)
-                     VALUES (?, ?, ?, ?)""",
-                (token, user_id, now.isoformat(), expires.isoformat()),
-            )
+            # Logins are rare next to auth checks, so garbage-collect here.
+            conn.execute(_SQL_PURGE_EXPIRED_SESSIONS)
+            conn.execute(_SQL_INSERT_SESSION, (token, user_id, self.SESSION_LIFETIME_HOURS * 3600))
 
     def get_user_id_by_token(self, token: str) -> Optional[int]:
-        with get_conn() as conn:
-            row = conn.execute("SELECT user_id, expires_at FROM sessions WHERE token = ?", (token,)).fetchone()
-        if not row:
-            return None
-        expires_at = datetime.fromisoformat(row["expires_at"])
-        if expires_at < datetime.now(timezone.utc):
-            self.delete_session(token)
-            return None
-        return int(row["user_id"])
+        with get_conn(readonly=True) as conn:
+            user_id = fetch_scalar(conn, _SQL_GET_SESSION_USER_ID, (token,))
+        return None if user_id is None else int(user_id)
 
     def delete_session(self, token: str) -> None:
         with get_conn() as conn:
-            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+            conn.execute(_SQL_DELETE_SESSION, (token,))
@@ -6,164 +6,93 @@ This module talks directly to SQLite (via get_conn()) and returns model objects.
 Keep it very boring: no business rules here.
 """
 
-from datetime import datetime, timezone
 from typing import Optional, Tuple
 
 from app.db.database import get_conn
 from app.models.user import User
 
+# Column order matches User's fields; rows are built with User(*row).
+_USER_COLS = "id, username, display_name, bio, created_at, is_admin"
+_SQL_INSERT_USER = f"""INSERT INTO users (username, password_hash, created_at, is_admin)
+                     VALUES (?, ?, strftime('%s', 'now'), 0)
+                     RETURNING {_USER_COLS}"""
+_SQL_GET_USER = f"""SELECT {_USER_COLS}
+                     FROM users WHERE id = ?"""
+_SQL_GET_USER_WITH_HASH_BY_USERNAME = f"""SELECT {_USER_COLS}, password_hash
+                     FROM users WHERE username = ?"""
+_SQL_UPDATE_PROFILE = f"""UPDATE users SET display_name = ?, bio = ? WHERE id = ?
+                     RETURNING {_USER_COLS}"""
+_SQL_UPDATE_USERNAME = f"""UPDATE users SET username = ? WHERE id = ?
+                     RETURNING {_USER_COLS}"""
+_SQL_UPDATE_PASSWORD_HASH = "UPDATE users SET password_hash = ? WHERE id = ?"
+_SQL_DELETE_USER = "DELETE FROM users WHERE id = ?"
+_SQL_LIST_USERS = f"SELECT {_USER_COLS} FROM users ORDER BY id ASC"
+
 
 class UserRepo:
     # ---------- create / read ----------
 
     def create_user(self, username: str, password_hash: str) -> User:
-        now = datetime.now(timezone.utc).isoformat()
-
         with get_conn() as conn:
-            cur = conn.execute(
-                """INSERT INTO users (username, password_hash, created_at, is_admin)
-                     VALUES (?, ?, ?, 0)""",
-                (username, password_hash, now),
-            )
-            user_id = int(cur.lastrowid)
-            row = conn.execute(
-                """SELECT id, username, display_name, bio, created_at, is_admin
-                     FROM users WHERE id = ?""",
-                (user_id,),
-            ).fetchone()
-
-        return User(
-            id=row["id"],
-            username=row["username"],
-            display_name=row["display_name"],
-            bio=row["bio"],
-            created_at=row["created_at"],
-            is_admin=row["is_admin"],
-        )
+            row = conn.execute(_SQL_INSERT_USER, (username, password_hash)).fetchone()
+
+        return User(*row)
 
     def get_user_by_username_with_hash(self, username: str) -> Optional[Tuple[User, str]]:
-        with get_conn() as conn:
-            row = conn.execute(
-                """SELECT id, username, password_hash, display_name, bio, created_at, is_admin
-                     FROM users WHERE username = ?""",
-                (username,),
-            ).fetchone()
+        with get_conn(readonly=True) as conn:
+            row = conn.execute(_SQL_GET_USER_WITH_HASH_BY_USERNAME, (username,)).fetchone()
 
         if not row:
             return None
 
-        user = User(
-            id=row["id"],
-            username=row["username"],
-            display_name=row["display_name"],
-            bio=row["bio"],
-            created_at=row["created_at"],
-            is_admin=row["is_admin"],
-        )
-        return user, row["password_hash"]
+        # password_hash is selected last so the leading columns match User.
+        return User(*row[:6]), row[6]
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
-        with get_conn() as conn:
-            row = conn.execute(
-                """SELECT id, username, display_name, bio, created_at, is_admin
-                     FROM users WHERE id = ?""",
-                (user_id,),
-            ).fetchone()
+        with get_conn(readonly=True) as conn:
+            row = conn.execute(_SQL_GET_USER, (user_id,)).fetchone()
 
         if not row:
             return None
 
-        return User(
-            id=row["id"],
-            username=row["username"],
-            display_name=row["display_name"],
-            bio=row["bio"],
-            created_at=row["created_at"],
-            is_admin=row["is_admin"],
-        )
+        return User(*row)
 
     # ---------- updates ----------
 
     def update_profile(self, user_id: int, display_name: str, bio: str) -> Optional[User]:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE users SET display_name = ?, bio = ? WHERE id = ?",
-                (display_name, bio, user_id),
-            )
-            row = conn.execute(
-                """SELECT id, username, display_name, bio, created_at, is_admin
-                     FROM users WHERE id = ?""",
-                (user_id,),
-            ).fetchone()
+            row = conn.execute(_SQL_UPDATE_PROFILE, (display_name, bio, user_id)).fetchone()
 
         if not row:
             return None
 
-        return User(
-            id=row["id"],
-            username=row["username"],
-            display_name=row["display_name"],
-            bio=row["bio"],
-            created_at=row["created_at"],
-            is_admin=row["is_admin"],
-        )
+        return User(*row)
 
     def update_username(self, user_id: int, new_username: str) -> Optional[User]:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE users SET username = ? WHERE id = ?",
-                (new_username, user_id),
-            )
-            row = conn.execute(
-                """SELECT id, username, display_name, bio, created_at, is_admin
-                     FROM users WHERE id = ?""",
-                (user_id,),
-            ).fetchone()
+            row = conn.execute(_SQL_UPDATE_USERNAME, (new_username, user_id)).fetchone()
 
         if not row:
             return None
 
-        return User(
-            id=row["id"],
-            username=row["username"],
-            display_name=row["display_name"],
-            bio=row["bio"],
-            created_at=row["created_at"],
-            is_admin=row["is_admin"],
-        )
+        return User(*row)
 
     def update_password_hash(self, user_id: int, new_password_hash: str) -> None:
         """Update password hash for a user."""
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE users SET password_hash = ? WHERE id = ?",
-                (new_password_hash, user_id),
-            )
+            conn.execute(_SQL_UPDATE_PASSWORD_HASH, (new_password_hash, user_id))
 
     # ---------- deletes ----------
 
     def delete_user(self, user_id: int) -> None:
         """Delete a user. Related rows are removed via ON DELETE CASCADE."""
         with get_conn() as conn:
-            conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            conn.execute(_SQL_DELETE_USER, (user_id,))
 
     # ---------- admin views ----------
 
     def list_users(self) -> list[User]:
         """Admin: list all users."""
-        with get_conn() as conn:
-            rows = conn.execute(
-                "SELECT id, username, display_name, bio, created_at, is_admin FROM users ORDER BY id ASC"
-            ).fetchall()
-
-        return [
-            User(
-                id=r["id"],
-                username=r["username"],
-                display_name=r["display_name"],
-                bio=r["bio"],
-                created_at=r["created_at"],
-                is_admin=r["is_admin"],
-            )
-            for r in rows
-        ]
+        with get_conn(readonly=True) as conn:
+            rows = conn.execute(_SQL_LIST_USERS).fetchall()
+        return [User(*r) for r in rows]
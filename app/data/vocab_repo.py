@@ -1,11 +1,103 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import sqlite3
+import threading
 from typing import List, Optional
 
 from app.db.database import get_conn
 from app.models.vocab import Favourite, HistoryItem
 
+# Column order matches Favourite's fields; rows are built with Favourite(*row).
+_FAVOURITE_COLS = "id, user_id, headword, notes, mastery, created_at"
+# Column order matches HistoryItem's fields; rows are built with HistoryItem(*row).
+_HISTORY_COLS = "id, user_id, dict_id, headword, created_at"
+_SQL_UPSERT_FAVOURITE = """INSERT INTO favourites (user_id, headword, notes, mastery, created_at)
+                     VALUES (?, ?, ?, ?, COALESCE(?, strftime('%s', 'now')))
+                     ON CONFLICT(user_id, headword)
+                     DO UPDATE SET
+                        notes=excluded.notes,
+                        mastery=excluded.mastery,
+                        created_at=excluded.created_at"""
+_SQL_LIST_FAVOURITES = f"""SELECT {_FAVOURITE_COLS}
+                     FROM favourites
+                     WHERE user_id = ?
+                     ORDER BY headword COLLATE NOCASE ASC
+                     LIMIT ? OFFSET ?"""
+_SQL_GET_FAVOURITE = f"""SELECT {_FAVOURITE_COLS}
+                     FROM favourites
+                     WHERE id = ? AND user_id = ?"""
+_SQL_GET_FAVOURITE_BY_WORD = f"""SELECT {_FAVOURITE_COLS}
+                     FROM favourites
+                     WHERE user_id = ? AND headword COLLATE BINARY = ? COLLATE BINARY"""
+_SQL_DELETE_FAVOURITE = "DELETE FROM favourites WHERE id = ? AND user_id = ?"
+_SQL_DELETE_ALL_FAVOURITES = "DELETE FROM favourites WHERE user_id = ?"
+_SQL_UPDATE_FAVOURITE_NOTES = "UPDATE favourites SET notes = ? WHERE id = ? AND user_id = ?"
+_SQL_UPDATE_FAVOURITE_MASTERY = "UPDATE favourites SET mastery = ? WHERE id = ? AND user_id = ?"
+
+_SQL_INSERT_HISTORY = """INSERT INTO history (user_id, dict_id, headword, created_at)
+                     VALUES (?, ?, ?, strftime('%s', 'now'))"""
+_SQL_LIST_HISTORY = f"""SELECT {_HISTORY_COLS}
+                     FROM history
+                     WHERE user_id = ?
+                     ORDER BY id DESC
+                     LIMIT ?"""
+_SQL_DELETE_HISTORY_ITEM = "DELETE FROM history WHERE id = ? AND user_id = ?"
+_SQL_CLEAR_HISTORY = "DELETE FROM history WHERE user_id = ?"
+
+# Every dictionary lookup records history, so rows are buffered and written in
+# one executemany transaction per batch instead of one commit per lookup.
+_HISTORY_FLUSH_INTERVAL = 0.25
+_HISTORY_FLUSH_MAX = 100
+_history_buffer: list[tuple[int, int, str]] = []
+_history_lock = threading.Lock()
+# Held for a whole flush so batches reach the table in the order they were taken.
+_history_flush_lock = threading.Lock()
+_history_timer: threading.Timer | None = None
+
+
+def _requeue_history(rows: list[tuple[int, int, str]]) -> None:
+    """Put unwritten rows back at the front of the buffer and retry them later."""
+    global _history_timer
+    with _history_lock:
+        _history_buffer[:0] = rows
+        if _history_timer is None:
+            _history_timer = threading.Timer(_HISTORY_FLUSH_INTERVAL, flush_history)
+            _history_timer.daemon = True
+            _history_timer.start()
+
+
+def flush_history() -> None:
+    """Write any buffered history rows now."""
+    global _history_timer
+    with _history_flush_lock:
+        with _history_lock:
+            batch = _history_buffer[:]
+            _history_buffer.clear()
+            if _history_timer is not None:
+                _history_timer.cancel()
+                _history_timer = None
+        if not batch:
+            return
+        try:
+            with get_conn() as conn:
+                conn.executemany(_SQL_INSERT_HISTORY, batch)
+        except sqlite3.OperationalError:
+            # e.g. "database is locked" past busy_timeout. The transaction was
+            # rolled back, so the whole batch is retried on the next tick.
+            _requeue_history(batch)
+        except sqlite3.IntegrityError:
+            # A user or dictionary was deleted while its rows were buffered;
+            # keep the rest of the batch.
+            for i, row in enumerate(batch):
+                try:
+                    with get_conn() as conn:
+                        conn.execute(_SQL_INSERT_HISTORY, row)
+                except sqlite3.IntegrityError:
+                    pass
+                except sqlite3.OperationalError:
+                    _requeue_history(batch[i:])
+                    return
+
 
 class VocabRepo:
     """SQL-only data access for favourites (vocabulary) + history."""
@@ -19,144 +111,85 @@ class VocabRepo:
         headword: str,
         notes: str,
         mastery: int,
-        created_at: str | None = None,
+        created_at: int | None = None,
     ) -> None:
-        now = created_at or datetime.now(timezone.utc).isoformat()
         with get_conn() as conn:
-            conn.execute(
-                """INSERT INTO favourites (user_id, headword, notes, mastery, created_at)
-                     VALUES (?, ?, ?, ?, ?)
-                     ON CONFLICT(user_id, headword)
-                     DO UPDATE SET
-                        notes=excluded.notes,
-                        mastery=excluded.mastery,
-                        created_at=excluded.created_at""",
-                (user_id, headword, notes, mastery, now),
-            )
+            conn.execute(_SQL_UPSERT_FAVOURITE, (user_id, headword, notes, mastery, created_at))
 
-    def list_favourites(self, user_id: int) -> List[Favourite]:
+    def upsert_favourites(self, rows: list[tuple[int, str, str, int, int | None]]) -> None:
+        """Upsert many (user_id, headword, notes, mastery, created_at) rows in one transaction."""
+        if not rows:
+            return
         with get_conn() as conn:
-            rows = conn.execute(
-                """SELECT id, user_id, headword, notes, mastery, created_at
-                     FROM favourites
-                     WHERE user_id = ?
-                     ORDER BY headword COLLATE NOCASE ASC""",
-                (user_id,),
-            ).fetchall()
-
-        return [
-            Favourite(
-                id=r["id"],
-                user_id=r["user_id"],
-                headword=r["headword"],
-                notes=r["notes"],
-                mastery=r["mastery"],
-                created_at=r["created_at"],
-            )
-            for r in rows
-        ]
+            conn.executemany(_SQL_UPSERT_FAVOURITE, rows)
+
+    def list_favourites(self, user_id: int, limit: int | None = None, offset: int = 0) -> List[Favourite]:
+        # SQLite treats LIMIT -1 as "no limit".
+        with get_conn(readonly=True) as conn:
+            rows = conn.execute(_SQL_LIST_FAVOURITES, (user_id, -1 if limit is None else limit, offset)).fetchall()
+        return [Favourite(*r) for r in rows]
 
     def get_favourite(self, fav_id: int, user_id: int) -> Optional[Favourite]:
-        with get_conn() as conn:
-            r = conn.execute(
-                """SELECT id, user_id, headword, notes, mastery, created_at
-                     FROM favourites
-                     WHERE id = ? AND user_id = ?""",
-                (fav_id, user_id),
-            ).fetchone()
+        with get_conn(readonly=True) as conn:
+            r = conn.execute(_SQL_GET_FAVOURITE, (fav_id, user_id)).fetchone()
 
         if not r:
             return None
 
-        return Favourite(
-            id=r["id"],
-            user_id=r["user_id"],
-            headword=r["headword"],
-            notes=r["notes"],
-            mastery=r["mastery"],
-            created_at=r["created_at"],
-        )
+        return Favourite(*r)
 
     def get_favourite_by_word(self, user_id: int, headword: str) -> Optional[Favourite]:
-        with get_conn() as conn:
-            r = conn.execute(
-                """SELECT id, user_id, headword, notes, mastery, created_at
-                     FROM favourites
-                     WHERE user_id = ? AND headword COLLATE BINARY = ? COLLATE BINARY""",
-                (user_id, headword),
-            ).fetchone()
+        with get_conn(readonly=True) as conn:
+            r = conn.execute(_SQL_GET_FAVOURITE_BY_WORD, (user_id, headword)).fetchone()
 
         if not r:
             return None
 
-        return Favourite(
-            id=r["id"],
-            user_id=r["user_id"],
-            headword=r["headword"],
-            notes=r["notes"],
-            mastery=r["mastery"],
-            created_at=r["created_at"],
-        )
+        return Favourite(*r)
 
     def delete_favourite(self, fav_id: int, user_id: int) -> None:
         with get_conn() as conn:
-            conn.execute("DELETE FROM favourites WHERE id = ? AND user_id = ?", (fav_id, user_id))
+            conn.execute(_SQL_DELETE_FAVOURITE, (fav_id, user_id))
 
     def delete_all_favourites(self, user_id: int) -> None:
         with get_conn() as conn:
-            conn.execute("DELETE FROM favourites WHERE user_id = ?", (user_id,))
+            conn.execute(_SQL_DELETE_ALL_FAVOURITES, (user_id,))
 
     def update_favourite_notes(self, fav_id: int, user_id: int, notes: str) -> None:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE favourites SET notes = ? WHERE id = ? AND user_id = ?",
-                (notes, fav_id, user_id),
-            )
+            conn.execute(_SQL_UPDATE_FAVOURITE_NOTES, (notes, fav_id, user_id))
 
     def update_favourite_mastery(self, fav_id: int, user_id: int, mastery: int) -> None:
         with get_conn() as conn:
-            conn.execute(
-                "UPDATE favourites SET mastery = ? WHERE id = ? AND user_id = ?",
-                (mastery, fav_id, user_id),
-            )
+            conn.execute(_SQL_UPDATE_FAVOURITE_MASTERY, (mastery, fav_id, user_id))
 
     # -------------
     # History
     # -------------
     def add_history(self, user_id: int, dict_id: int, headword: str) -> None:
-        now = datetime.now(timezone.utc).isoformat()
-        with get_conn() as conn:
-            conn.execute(
-                "INSERT INTO history (user_id, dict_id, headword, created_at) VALUES (?, ?, ?, ?)",
-                (user_id, dict_id, headword, now),
-            )
+        global _history_timer
+        with _history_lock:
+            _history_buffer.append((user_id, dict_id, headword))
+            flush_now = len(_history_buffer) >= _HISTORY_FLUSH_MAX
+            if not flush_now and _history_timer is None:
+                _history_timer = threading.Timer(_HISTORY_FLUSH_INTERVAL, flush_history)
+                _history_timer.daemon = True
+                _history_timer.start()
+        if flush_now:
+            flush_history()
 
     def list_history(self, user_id: int, limit: int = 200) -> List[HistoryItem]:
-        with get_conn() as conn:
-            rows = conn.execute(
-                """SELECT id, user_id, dict_id, headword, created_at
-                     FROM history
-                     WHERE user_id = ?
-                     ORDER BY id DESC
-                     LIMIT ?""",
-                (user_id, limit),
-            ).fetchall()
-
-        return [
-            HistoryItem(
-                id=r["id"],
-                user_id=r["user_id"],
-                dict_id=r["dict_id"],
-                headword=r["headword"],
-                created_at=r["created_at"],
-            )
-            for r in rows
-        ]
+        flush_history()
+        with get_conn(readonly=True) as conn:
+            rows = conn.execute(_SQL_LIST_HISTORY, (user_id, limit)).fetchall()
+        return [HistoryItem(*r) for r in rows]
 
     def delete_history_item(self, item_id: int, user_id: int) -> None:
+        flush_history()
         with get_conn() as conn:
-            conn.execute("DELETE FROM history WHERE id = ? AND user_id = ?", (item_id, user_id))
+            conn.execute(_SQL_DELETE_HISTORY_ITEM, (item_id, user_id))
 
     def clear_history(self, user_id: int) -> None:
+        flush_history()
         with get_conn() as conn:
-            conn.execute("DELETE FROM history WHERE user_id = ?", (user_id,))
+            conn.execute(_SQL_CLEAR_HISTORY, (user_id,))
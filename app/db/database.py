@@ -1,225 +1,361 @@
 from __future__ import annotations
 
+import queue
+import re
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
 
 from app.config import settings
 
-def _connect(db_path: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
+# Pooled connections live for the whole process, so per-connection setup
+# (pragmas, page cache, statement cache) is paid once instead of per request.
+_READ_POOL_SIZE = 8
+# Stored in PRAGMA user_version once init_db() has brought a file up to date.
+# Bump it whenever the DDL or migrations below change so existing files are
+# re-checked on the next start.
+_SCHEMA_VERSION = 3
+# journal_mode is stored in the database file, so init_db() sets it once;
+# everything below is per-connection and is applied when a pooled connection
+# is first opened.
+_DATABASE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+)
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA wal_autocheckpoint = 1000;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA cache_size = -65536;",
+    # Wait for a lock held by another process (e.g. a second uvicorn worker)
+    # instead of failing immediately with "database is locked".
+    "PRAGMA busy_timeout = 5000;",
+    # Bound the sampling done by the periodic PRAGMA optimize on large tables.
+    "PRAGMA analysis_limit = 400;",
+    "PRAGMA foreign_keys = ON;",
+)
+
+_pool_lock = threading.Lock()
+_read_pool: queue.Queue[sqlite3.Connection] | None = None
+_writer: sqlite3.Connection | None = None
+# SQLite allows a single writer at a time; serialize writes in-process.
+_writer_lock = threading.Lock()
+# Pooled connections are never closed per request, so PRAGMA optimize runs on
+# the writer every N write transactions and again from close_pool().
+_OPTIMIZE_EVERY = 1000
+_writer_uses = 0
+
+
+def _connect(db_path: Path, readonly: bool = False) -> sqlite3.Connection:
+    # Repos reuse a fixed set of SQL strings; keep them all prepared.
+    # Rows stay plain tuples: repos select columns in model field order and
+    # build models with Model(*row), so sqlite3.Row's name lookup is unused.
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=128)
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    if readonly:
+        # Reader connections reject writes outright; every write must go
+        # through the single writer so _writer_lock can serialize it.
+        conn.execute("PRAGMA query_only = ON;")
     return conn
 
+
+def _ensure_pool() -> None:
+    global _read_pool, _writer
+    if _read_pool is not None:
+        return
+    with _pool_lock:
+        if _read_pool is not None:
+            return
+        _writer = _connect(settings.DB_PATH)
+        pool: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=_READ_POOL_SIZE)
+        for _ in range(_READ_POOL_SIZE):
+            pool.put(_connect(settings.DB_PATH, readonly=True))
+        _read_pool = pool
+
+
 @contextmanager
-def get_conn() -> Iterator[sqlite3.Connection]:
-    conn = _connect(settings.DB_PATH)
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
-def _try_add_column(conn: sqlite3.Connection, table: str, col_def: str) -> None:
-    """Small helper for demo-style schema evolution."""
+def get_conn(readonly: bool = False) -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection.
+
+    Writes go through the single writer connection; ``readonly=True`` borrows
+    one of the reader connections instead, which WAL lets run concurrently.
+    """
+    _ensure_pool()
+    if readonly:
+        conn = _read_pool.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            _read_pool.put(conn)
+        return
+
+    global _writer_uses
+    with _writer_lock:
+        conn = _writer
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        _writer_uses += 1
+        if _writer_uses % _OPTIMIZE_EVERY == 0:
+            _optimize(conn)
+
+
+def _optimize(conn: sqlite3.Connection) -> None:
+    # Housekeeping only: the caller's write has already committed, so e.g. a
+    # "database is locked" from another worker must not be reported as its
+    # failure. The next round (or close_pool) tries again.
     try:
-        conn.execute(f"ALTER TABLE {table} ADD COLUMN {col_def};")
-    except sqlite3.OperationalError:
-        pass
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+
+
+def close_pool() -> None:
+    """Run PRAGMA optimize and close every pooled connection."""
+    global _read_pool, _writer
+    with _pool_lock:
+        if _read_pool is None:
+            return
+        with _writer_lock:
+            _optimize(_writer)
+            _writer.close()
+            _writer = None
+        while not _read_pool.empty():
+            _read_pool.get_nowait().close()
+        _read_pool = None
 
-def _table_has_column(conn: sqlite3.Connection, table: str, column: str) -> bool:
-    rows = conn.execute(f"PRAGMA table_info({table});").fetchall()
-    return any(r["name"] == column for r in rows)
+def fetch_scalar(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> object | None:
+    """Return the first column of the first row, or None if there is no row."""
+    row = conn.execute(sql, params).fetchone()
+    return row[0] if row else None
 
-def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
-    row = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name=?;",
-        (table,),
-    ).fetchone()
-    return bool(row)
+def _load_schema(conn: sqlite3.Connection) -> dict[str, dict[str, str]]:
+    """Map every table to its {column: declared type} in one query."""
+    schema: dict[str, dict[str, str]] = {}
+    rows = conn.execute(
+        """SELECT m.name, p.name, p.type
+             FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p
+            WHERE m.type = 'table';"""
+    ).fetchall()
+    for table, column, col_type in rows:
+        schema.setdefault(table, {})[column] = col_type
+    return schema
+
+def _add_column_if_missing(
+    conn: sqlite3.Connection, schema: dict[str, dict[str, str]], table: str, column: str, col_def: str
+) -> None:
+    """Small helper for demo-style schema evolution on an existing table."""
+    if table in schema and column not in schema[table]:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_def};")
+        schema[table][column] = col_def.split()[0]
 
 def init_db() -> None:
     """Create tables if they don't exist.
 
     NOTE: You said you'll recreate the database when schema changes.
     In practice, it's convenient to allow restarting the dev server with an existing DB file,
-    so we also do a small, best-effort patch for the favourites schema.
+    so we also do a small, best-effort patch of older sessions/created_at columns.
+    Files already stamped with the current _SCHEMA_VERSION skip all of this.
     """
     settings.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     settings.DICT_ROOT.mkdir(parents=True, exist_ok=True)
 
     with get_conn() as conn:
-        # ---- Users ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL UNIQUE,
-                password_hash TEXT NOT NULL,
-                display_name TEXT NOT NULL DEFAULT '',
-                bio TEXT NOT NULL DEFAULT '',
-                created_at TEXT NOT NULL
-            );
-            """
-        )
-        _try_add_column(conn, "users", "is_admin INTEGER NOT NULL DEFAULT 0")
-
-        # ---- Sessions ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS sessions (
-                token TEXT PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                created_at TEXT NOT NULL,
-                expires_at TEXT NOT NULL,
-                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-            """
-        )
+        for pragma in _DATABASE_PRAGMAS:
+            conn.execute(pragma)
 
-        # ---- Ideas ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS ideas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                details TEXT NOT NULL DEFAULT '',
-                created_at TEXT NOT NULL,
-                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-            """
-        )
+        # An up-to-date file needs no DDL at all.
+        if fetch_scalar(conn, "PRAGMA user_version;") == _SCHEMA_VERSION:
+            return
 
-        # ---- Dictionaries ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS dictionaries (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                folder TEXT NOT NULL,
-                mdx_filename TEXT NOT NULL,
-                css_filename TEXT,
-                cover_filename TEXT,
-                created_at TEXT NOT NULL
-            );
-            """
-        )
+        # Rebuilding a table must not cascade into its children, and
+        # foreign_keys can only be toggled outside a transaction. sqlite3
+        # autocommits DDL, so open the transaction explicitly; the whole
+        # bootstrap then lands in one commit. IMMEDIATE takes the write lock
+        # up front, where busy_timeout applies: a deferred BEGIN would fail
+        # outright when its read lock could not be upgraded because another
+        # worker was migrating at the same time.
+        conn.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            # Another worker may have finished the migration while we waited.
+            if fetch_scalar(conn, "PRAGMA user_version;") == _SCHEMA_VERSION:
+                return
+            _create_schema(conn)
+            conn.commit()
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("PRAGMA foreign_keys = ON;")
 
-        # ---- History ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                dict_id INTEGER NOT NULL,
-                headword TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
-                FOREIGN KEY(dict_id) REFERENCES dictionaries(id) ON DELETE CASCADE
-            );
-            """
-        )
 
-        # ---- Favourites (Vocabulary) ----
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS favourites (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                headword TEXT NOT NULL,
-                notes TEXT NOT NULL DEFAULT '',
-                mastery INTEGER NOT NULL DEFAULT 1,
-                created_at TEXT NOT NULL,
-                UNIQUE(user_id, headword),
-                FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-            );
-            """
-        )
+def _create_schema(conn: sqlite3.Connection) -> None:
+    # Read the existing schema once; the migration checks below consult it
+    # instead of issuing their own PRAGMA table_info probes.
+    schema = _load_schema(conn)
+
+    # ---- Users ----
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL,
+            display_name TEXT NOT NULL DEFAULT '',
+            bio TEXT NOT NULL DEFAULT '',
+            created_at INTEGER NOT NULL,
+            is_admin INTEGER NOT NULL DEFAULT 0
+        );
+        """
+    )
+    _add_column_if_missing(conn, schema, "users", "is_admin", "INTEGER NOT NULL DEFAULT 0")
+
+    # ---- Sessions ----
+    # Timestamps are unix-epoch seconds so expiry is an integer compare in SQL.
+    _maybe_migrate_sessions_schema(conn, schema)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            token TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    # ---- Ideas ----
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ideas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            details TEXT NOT NULL DEFAULT '',
+            created_at INTEGER NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    # ---- Dictionaries ----
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dictionaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            folder TEXT NOT NULL,
+            mdx_filename TEXT NOT NULL,
+            css_filename TEXT,
+            cover_filename TEXT,
+            created_at INTEGER NOT NULL
+        );
+        """
+    )
+
+    # ---- History ----
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            dict_id INTEGER NOT NULL,
+            headword TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY(dict_id) REFERENCES dictionaries(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    # ---- Favourites (Vocabulary) ----
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS favourites (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            headword TEXT NOT NULL,
+            notes TEXT NOT NULL DEFAULT '',
+            mastery INTEGER NOT NULL DEFAULT 1,
+            created_at INTEGER NOT NULL,
+            UNIQUE(user_id, headword),
+            FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """
+    )
+
+    # Older files stored created_at as ISO-8601 TEXT.
+    _maybe_migrate_created_at(conn, schema)
+
+    # ---- Indexes ----
+    # Each matches a repo query's WHERE + ORDER BY, so listing a user's
+    # rows is an index range scan with no temp b-tree sort.
+    # sessions.token is the PRIMARY KEY and is already indexed.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS ix_fav_user_hw ON favourites(user_id, headword COLLATE NOCASE);"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_hist_user_id ON history(user_id, id DESC);")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_ideas_user_id ON ideas(user_id, id DESC);")
+    # Lets ON DELETE CASCADE find a deleted user's sessions without a scan.
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions(user_id);")
 
-        # Best-effort: if an older favourites table exists, ensure required columns exist.
-        _maybe_migrate_favourites_schema(conn)
+    # Collect planner statistics the first time the indexes exist.
+    if "sqlite_stat1" not in schema:
+        conn.execute("ANALYZE;")
 
+    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION};")
 
-def _maybe_migrate_favourites_schema(conn) -> None:
-    """Best-effort, backwards-compatible schema patching.
 
-    You said you'll recreate the DB when schema changes; however, dev servers are often restarted
-    with an existing app.db file. This function prevents startup crashes by ensuring required
-    columns exist (idempotent). It will *not* attempt to rewrite indexes/collations.
+def _maybe_migrate_sessions_schema(conn: sqlite3.Connection, schema: dict[str, dict[str, str]]) -> None:
+    """Drop a sessions table that still stores ISO-8601 TEXT timestamps.
+
+    Sessions are disposable, so rather than converting rows we let the table be
+    recreated with INTEGER columns; affected users simply log in again.
     """
-    try:
-        rows = conn.execute("PRAGMA table_info(favourites);").fetchall()
-    except Exception:
-        return
-    cols = {r[1] for r in rows}  # (cid, name, type, notnull, dflt_value, pk)
-    if not rows:
-        return
+    if schema.get("sessions", {}).get("expires_at", "").upper() == "TEXT":
+        conn.execute("DROP TABLE sessions;")
+        del schema["sessions"]
+
 
-# Migration Helper
-# # If an older schema used NOCASE collation on headword or the UNIQUE index,
-# # "I" and "i" would be treated as the same word. Rebuild the table to restore
-# # case-sensitive behaviour.
-# try:
-#     row = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='favourites';").fetchone()
-#     table_sql = (row[0] if row else "") or ""
-# except Exception:
-#     table_sql = ""
-
-# if "NOCASE" in table_sql.upper():
-#     try:
-#         conn.execute("ALTER TABLE favourites RENAME TO favourites_old;")
-#         conn.execute(
-#             """
-#             CREATE TABLE favourites (
-#                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-#                 user_id INTEGER NOT NULL,
-#                 headword TEXT NOT NULL,
-#                 notes TEXT NOT NULL DEFAULT '',
-#                 mastery INTEGER NOT NULL DEFAULT 1,
-#                 created_at TEXT NOT NULL,
-#                 UNIQUE(user_id, headword),
-#                 FOREIGN KEY(user_id) REFERENCES users(id) ON DELETE CASCADE
-#             );
-#             """
-#         )
-#         # Copy best-effort (duplicates differing only by case couldn't exist in old schema anyway)
-#         conn.execute(
-#             """INSERT INTO favourites (id, user_id, headword, notes, mastery, created_at)
-#                  SELECT id, user_id, headword, notes,
-#                         COALESCE(mastery, 1) as mastery,
-#                         created_at
-#                  FROM favourites_old;"""
-#         )
-#         conn.execute("DROP TABLE favourites_old;")
-#         # Refresh column set after rebuild
-#         rows = conn.execute("PRAGMA table_info(favourites);").fetchall()
-#         cols = {r[1] for r in rows}
-#     except Exception:
-#         # If rebuild fails, keep running with the existing table.
-#         pass
-
-#     # New in v7: mastery
-#     if "mastery" not in cols:
-#         try:
-#             conn.execute("ALTER TABLE favourites ADD COLUMN mastery INTEGER NOT NULL DEFAULT 1;")
-#         except Exception:
-#             pass
-
-#     # Ensure notes exists (older versions might have NULLable notes)
-#     if "notes" not in cols:
-#         try:
-#             conn.execute("ALTER TABLE favourites ADD COLUMN notes TEXT NOT NULL DEFAULT '';")
-#         except Exception:
-#             pass
-
-#     if "created_at" not in cols:
-#         try:
-#             conn.execute("ALTER TABLE favourites ADD COLUMN created_at TEXT NOT NULL DEFAULT '';")
-#         except Exception:
-#             pass
+_EPOCH_TABLES = ("users", "ideas", "dictionaries", "history", "favourites")
+
+
+def _maybe_migrate_created_at(conn: sqlite3.Connection, schema: dict[str, dict[str, str]]) -> None:
+    """Rebuild tables whose created_at column is still ISO-8601 TEXT.
+
+    The column's declared type decides its affinity, so ALTER-ing values in
+    place is not enough. Each table is copied into an INTEGER-typed twin,
+    converting timestamps to unix-epoch seconds, then swapped in. Indexes are
+    recreated by init_db afterwards.
+    """
+    for table in _EPOCH_TABLES:
+        cols = schema.get(table)
+        if not cols or cols.get("created_at", "").upper() != "TEXT":
+            continue
+        (table_sql,) = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?;", (table,)
+        ).fetchone()
+        new_sql = re.sub(r"^CREATE TABLE\s+\S+", f"CREATE TABLE {table}__new", table_sql)
+        new_sql = re.sub(r"\bcreated_at\s+TEXT\b", "created_at INTEGER", new_sql, flags=re.IGNORECASE)
+        conn.execute(new_sql)
+        col_list = ", ".join(cols)
+        select_list = ", ".join(
+            # Numeric strings are already epoch seconds; unparseable values become 0.
+            "COALESCE(CAST(strftime('%s', created_at) AS INTEGER), CAST(created_at AS INTEGER))"
+            if c == "created_at" else c
+            for c in cols
+        )
+        conn.execute(f"INSERT INTO {table}__new ({col_list}) SELECT {select_list} FROM {table};")
+        conn.execute(f"DROP TABLE {table};")
+        conn.execute(f"ALTER TABLE {table}__new RENAME TO {table};")
+        cols["created_at"] = "INTEGER"
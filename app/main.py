@@ -2,7 +2,8 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
-from app.db.database import init_db
+from app.data.vocab_repo import flush_history
+from app.db.database import close_pool, init_db
 from app.web.routers import home, auth, profile, ideas, dictionary, vocab, history, admin_dicts, admin_users, dict_assets
 
 app = FastAPI(title="Layered FastAPI Dictionary App")
@@ -11,6 +12,11 @@ app = FastAPI(title="Layered FastAPI Dictionary App")
 def on_startup() -> None:
     init_db()
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    flush_history()
+    close_pool()
+
 app.mount("/static", StaticFiles(directory="app/web/static"), name="static")
 
 app.include_router(home.router)
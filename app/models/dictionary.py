@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class Dictionary:
     id: int
     name: str
@@ -9,4 +9,4 @@ class Dictionary:
     mdx_filename: str
     css_filename: str | None
     cover_filename: str | None
-    created_at: str
+    created_at: int
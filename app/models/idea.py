@@ -1,10 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class Idea:
     id: int
     user_id: int
     title: str
     details: str
-    created_at: str
+    created_at: int
@@ -1,11 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class User:
     id: int
     username: str
     display_name: str
     bio: str
-    created_at: str
+    created_at: int
     is_admin: int
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class Favourite:
     """A vocabulary-book entry.
 
@@ -15,10 +15,10 @@ class Favourite:
     headword: str
     notes: str
     mastery: int
-    created_at: str
+    created_at: int
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class HistoryItem:
     """A history entry.
 
@@ -29,4 +29,4 @@ class HistoryItem:
     user_id: int
     dict_id: int
     headword: str
-    created_at: str
+    created_at: int
@@ -37,6 +37,9 @@ class AuthService:
     def login(self, username: str, password: str) -> AuthResult:
         found = self.user_repo.get_user_by_username_with_hash(username.strip())
         if not found:
+            # Burn the same PBKDF2 time as a real check so unknown usernames
+            # cannot be told apart by response time.
+            verify_password(password, "")
             raise AuthError("Invalid username or password.")
         user, stored_hash = found
         if not verify_password(password, stored_hash):
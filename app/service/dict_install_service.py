@@ -1,27 +1,34 @@
 from __future__ import annotations
 
-import re, shutil, zipfile
+import os, re, shutil, zipfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from app.config import settings
 from app.data.dict_repo import DictRepo
 from app.models.dictionary import Dictionary
+from app.service.mdx_service import clear_dictionary_caches, invalidate_dict_list
 
 class DictInstallError(Exception): pass
 
+# Cover-image fallback prefers earlier extensions, as the old per-extension globs did.
+_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+_UNSAFE_NAME_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+
 def _safe_name(name: str) -> str:
     name = name.strip()
-    name = re.sub(r"[^a-zA-Z0-9._-]+", "_", name)
+    name = _UNSAFE_NAME_RE.sub("_", name)
     return name[:80] or "dictionary"
 
 class DictInstallService:
     def __init__(self, dict_repo: DictRepo):
         self.dict_repo = dict_repo
 
-    def install_from_zip_bytes(self, name: str, zip_bytes: bytes) -> Dictionary:
+    def install_from_file(self, name: str, zip_file: BinaryIO) -> Dictionary:
+        """Install from a seekable ZIP file object without reading it into memory."""
         name = name.strip()
         if len(name) < 2:
             raise DictInstallError("Dictionary name is too short.")
@@ -31,26 +38,31 @@ class DictInstallService:
         target_dir.mkdir(parents=True, exist_ok=False)
 
         try:
-            zip_path = target_dir / "upload.zip"
-            zip_path.write_bytes(zip_bytes)
-            with zipfile.ZipFile(zip_path, "r") as z:
+            with zipfile.ZipFile(zip_file, "r") as z:
                 for member in z.namelist():
                     if Path(member).is_absolute() or ".." in Path(member).parts:
                         raise DictInstallError("ZIP contains unsafe paths.")
                 z.extractall(target_dir)
-            zip_path.unlink(missing_ok=True)
 
-            mdx_files = list(target_dir.rglob("*.mdx"))
+            # One walk of the extracted tree, classifying files by extension.
+            mdx_files, css_files, image_files = [], [], []
+            for dirpath, _dirnames, filenames in os.walk(target_dir):
+                for filename in filenames:
+                    ext = os.path.splitext(filename)[1].lower()
+                    if ext == ".mdx":
+                        mdx_files.append(Path(dirpath, filename))
+                    elif ext == ".css":
+                        css_files.append(Path(dirpath, filename))
+                    elif ext in _IMAGE_EXTS:
+                        image_files.append(Path(dirpath, filename))
+            image_files.sort(key=lambda p: _IMAGE_EXTS.index(p.suffix.lower()))
+
             if len(mdx_files) != 1:
                 raise DictInstallError("ZIP must contain exactly one .mdx file.")
             mdx_path = mdx_files[0]
 
-            css_files = list(target_dir.rglob("*.css"))
             css_path = css_files[0] if css_files else None
 
-            image_files = []
-            for ext in ("*.png","*.jpg","*.jpeg","*.webp","*.gif"):
-                image_files.extend(target_dir.rglob(ext))
             cover_path = None
             for cand in image_files:
                 if cand.name.lower().startswith(("cover","icon","logo")):
@@ -63,7 +75,9 @@ class DictInstallService:
             css_rel = str(css_path.relative_to(target_dir)) if css_path else None
             cover_rel = str(cover_path.relative_to(target_dir)) if cover_path else None
 
-            return self.dict_repo.create(name, rel_folder, mdx_rel, css_rel, cover_rel)
+            d = self.dict_repo.create(name, rel_folder, mdx_rel, css_rel, cover_rel)
+            invalidate_dict_list()
+            return d
 
         except Exception:
             shutil.rmtree(target_dir, ignore_errors=True)
@@ -75,3 +89,4 @@ class DictInstallService:
             return
         shutil.rmtree(settings.DICT_ROOT / d.folder, ignore_errors=True)
         self.dict_repo.delete(dict_id)
+        clear_dictionary_caches(dict_id)
@@ -7,8 +7,8 @@ class IdeaService:
     def __init__(self, idea_repo: IdeaRepo):
         self.idea_repo = idea_repo
 
-    def list_my_ideas(self, user_id: int) -> List[Idea]:
-        return self.idea_repo.list_by_user(user_id)
+    def list_my_ideas(self, user_id: int, limit: int | None = None, offset: int = 0) -> List[Idea]:
+        return self.idea_repo.list_by_user(user_id, limit, offset)
 
     def create_idea(self, user_id: int, title: str, details: str) -> Idea:
         title, details = title.strip(), details.strip()
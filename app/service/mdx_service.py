@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import mimetypes
+import os
+import pickle
 import re
+import sys
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
@@ -23,6 +29,18 @@ class DictLookupError(Exception):
     pass
 
 
+# Every dictionary page renders the dictionary picker, but the list only
+# changes on an admin install or delete. Those call invalidate_dict_list();
+# the TTL bounds how long another worker process can show a stale list.
+_DICT_LIST_TTL = 5.0
+_dict_list_cache: tuple[float, tuple[Dictionary, ...]] | None = None
+
+
+def invalidate_dict_list() -> None:
+    global _dict_list_cache
+    _dict_list_cache = None
+
+
 @dataclass(frozen=True)
 class EntryResult:
     """One matching entry returned by an MDX lookup.
@@ -47,8 +65,32 @@ class MdxService:
     def __init__(self, dict_repo: DictRepo):
         self.dict_repo = dict_repo
 
+    def _cached_dicts(self) -> tuple[Dictionary, ...]:
+        global _dict_list_cache
+        cached = _dict_list_cache
+        now = time.monotonic()
+        if cached is None or cached[0] <= now:
+            cached = _dict_list_cache = (now + _DICT_LIST_TTL, tuple(self.dict_repo.list_dicts()))
+        return cached[1]
+
     def list_dicts(self) -> list[Dictionary]:
-        return self.dict_repo.list_dicts()
+        return list(self._cached_dicts())
+
+    def get_dict(self, dict_id: int) -> Dictionary | None:
+        """Find a dictionary in the cached list, falling back to the database.
+
+        Dictionaries are never edited in place and install/delete invalidate
+        the list in the worker that made the change. An id missing from the
+        list may have just been installed by another worker, so it is looked
+        up directly, and the list is refreshed if the dictionary exists.
+        """
+        for d in self._cached_dicts():
+            if d.id == dict_id:
+                return d
+        d = self.dict_repo.get_by_id(dict_id)
+        if d is not None:
+            invalidate_dict_list()
+        return d
 
     # ----------------------------
     # CSS detection (fixes: no-format dictionaries with only mdx+mdd)
@@ -63,7 +105,7 @@ class MdxService:
         2) extracted *.css on disk
         3) *.css packed inside *.mdd (choose style/main if present)
         """
-        d = self.dict_repo.get_by_id(dict_id)
+        d = self.get_dict(dict_id)
         if not d:
             return None
 
@@ -71,29 +113,28 @@ class MdxService:
         if getattr(d, "css_filename", None):
             return str(d.css_filename).lstrip("/")
 
-        base_dir = (settings.DICT_ROOT / d.folder).resolve()
+        base_dir = Path(os.path.abspath(settings.DICT_ROOT / d.folder))
+        mdd_files, css_files = _get_dict_files_cached(dict_id, str(base_dir))
 
         # 2) Any extracted CSS on disk
-        css_files = list(base_dir.rglob("*.css"))
         if css_files:
             return str(css_files[0].relative_to(base_dir)).replace("\\", "/")
 
         # 3) Try CSS from MDD index
-        for mdd_path in base_dir.rglob("*.mdd"):
+        for mdd_path in mdd_files:
             mdd_map = _get_mdd_map_cached(dict_id, str(mdd_path))
-            css_keys = [k for k in mdd_map.keys() if k.lower().endswith(".css")]
+            # Lower each key once and reuse it for both the filter and the score.
+            css_keys = [(kl, k) for k in mdd_map for kl in (k.lower(),) if kl.endswith(".css")]
             if not css_keys:
                 continue
 
-            # Prefer style.css / main.css if possible
-            css_keys.sort(
-                key=lambda k: (
-                    "style" not in k.lower(),
-                    "main" not in k.lower(),
-                    len(k),
-                )
+            # Prefer style.css / main.css if possible; min() keeps the first
+            # of equally ranked keys, as the stable sort it replaces did.
+            _, best = min(
+                css_keys,
+                key=lambda pair: ("style" not in pair[0], "main" not in pair[0], len(pair[1])),
             )
-            return css_keys[0].lstrip("/")
+            return best.lstrip("/")
 
         return None
 
@@ -111,17 +152,20 @@ class MdxService:
         if not word:
             raise DictLookupError("Please enter a word.")
 
-        d = self.dict_repo.get_by_id(dict_id)
+        d = self.get_dict(dict_id)
         if not d:
             raise DictLookupError("Dictionary not found.")
         if MDX is None:
             raise DictLookupError("Missing dependency: readmdict. Run: pip install -r requirements.txt")
 
-        mdx_path = settings.DICT_ROOT / d.folder / d.mdx_filename
-        if not mdx_path.exists():
+        mdx_path = str(settings.DICT_ROOT / d.folder / d.mdx_filename)
+        try:
+            # The mtime is part of the cache key, so a replaced file is re-indexed.
+            mtime = os.stat(mdx_path).st_mtime_ns
+        except FileNotFoundError:
             raise DictLookupError("MDX file missing on server.")
 
-        exact_map, casefold_map = _get_mdx_maps_cached(dict_id, str(mdx_path))
+        exact_map, link_map = _get_mdx_maps_cached(dict_id, mdx_path, mtime)
 
         # 1) Exact match first
         lookup_key = word
@@ -130,7 +174,7 @@ class MdxService:
         # 2) Case-insensitive fallback (helps dictionaries where headwords are inconsistent)
         if vals is None:
             cf = word.casefold()
-            mapped = casefold_map.get(cf)
+            mapped = _get_mdx_casefold_cached(dict_id, mdx_path, mtime).get(cf)
             if mapped is not None:
                 lookup_key = mapped
                 vals = exact_map.get(lookup_key)
@@ -138,19 +182,26 @@ class MdxService:
         if not vals:
             return LookupResult(found=False, lookup_key=word, entries=[])
 
+        # Plain redirect keys were resolved when the maps were built.
+        entry_key = link_map.get(lookup_key, lookup_key)
+        if entry_key != lookup_key:
+            vals = exact_map[entry_key]
+
         # Each value record might itself be a redirect via '@@@LINK=target'.
         # We resolve redirects, and if the resolved key has multiple values, we include them all.
         entries: list[EntryResult] = []
-        seen: set[tuple[str, int]] = set()
+        # Duplicates can only arise from several records; most keys have one.
+        seen: set[tuple[str, int]] | None = set() if len(vals) > 1 else None
 
         for v in vals:
-            resolved_head, resolved_vals = self._resolve_mdx_link(exact_map, lookup_key, v)
+            resolved_head, resolved_vals = self._resolve_mdx_link(exact_map, entry_key, v)
             for rv in resolved_vals:
-                key = (resolved_head, hash(rv))
-                if key in seen:
-                    continue
-                seen.add(key)
-                html = rewrite_mdx_html(dict_id, _safe_decode(rv))
+                if seen is not None:
+                    key = (resolved_head, hash(rv))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                html = _render_entry_cached(dict_id, rv)
                 entries.append(EntryResult(headword=resolved_head, html=html))
 
         return LookupResult(found=True, lookup_key=lookup_key, entries=entries)
@@ -177,13 +228,7 @@ class MdxService:
         cur_val = val_b
 
         for _ in range(10):  # max depth
-            text = _safe_decode(cur_val)
-
-            m = re.search(r"@@@LINK=(?P<target>.+)", text)
-            if not m:
-                return cur_head, [cur_val]
-
-            target = m.group("target").strip()
+            target = _link_target(cur_val)
             if not target or target in seen:
                 return cur_head, [cur_val]
 
@@ -208,7 +253,7 @@ class MdxService:
         1) extracted files on disk
         2) packed files inside any MDD
         """
-        d = self.dict_repo.get_by_id(dict_id)
+        d = self.get_dict(dict_id)
         if not d:
             raise DictLookupError("Dictionary not found.")
 
@@ -220,43 +265,33 @@ class MdxService:
         asset_path = asset_path.split("?", 1)[0].split("#", 1)[0]
         asset_path = asset_path.lstrip("/")
 
-        base_dir = (settings.DICT_ROOT / d.folder).resolve()
-        candidate = (base_dir / asset_path).resolve()
+        # abspath normalizes ".." lexically without the per-component lstat()
+        # calls of Path.resolve(); extracted ZIPs contain no symlinks to follow.
+        base_dir = os.path.abspath(settings.DICT_ROOT / d.folder)
+        candidate = Path(os.path.abspath(os.path.join(base_dir, asset_path)))
 
         # Prevent path traversal
-        if not str(candidate).startswith(str(base_dir)):
+        if not str(candidate).startswith(base_dir + os.sep):
             raise DictLookupError("Invalid asset path.")
 
-        # 1) extracted file exists
-        if candidate.exists() and candidate.is_file():
-            data = candidate.read_bytes()
-            mime = mimetypes.guess_type(candidate.name)[0] or "application/octet-stream"
-            return data, mime
+        # 1) extracted file exists (is_file() is False for missing paths; one stat)
+        if candidate.is_file():
+            return candidate.read_bytes(), _mime_for(candidate.name)
 
         # 2) try MDD
         if MDD is None:
             raise DictLookupError("Asset not found.")
 
-        mdds = list(base_dir.rglob("*.mdd"))
+        mdds, _css_files = _get_dict_files_cached(dict_id, base_dir)
         if not mdds:
             raise DictLookupError("Asset not found.")
 
-        # Try a few variants because MDX and MDD keys are inconsistent about leading "/"
-        key_candidates = [
-            asset_path,
-            asset_path.lstrip("/"),
-            "/" + asset_path.lstrip("/"),
-        ]
-
+        # MDD keys are stored without a leading "/" and asset_path was
+        # normalized the same way above, so one probe per MDD is enough.
         for mdd_path in mdds:
-            mdd_map = _get_mdd_map_cached(dict_id, str(mdd_path))
-
-            for k in key_candidates:
-                k_norm = k.replace("\\", "/").lstrip("/")
-                if k_norm in mdd_map:
-                    value = mdd_map[k_norm]
-                    mime = mimetypes.guess_type(k_norm)[0] or "application/octet-stream"
-                    return value, mime
+            value = _get_mdd_map_cached(dict_id, str(mdd_path)).get(asset_path)
+            if value is not None:
+                return value, _mime_for(asset_path)
 
         raise DictLookupError("Asset not found.")
 
@@ -264,40 +299,225 @@ class MdxService:
 # ----------------------------
 # Caches
 # ----------------------------
-@lru_cache(maxsize=8)
-
-@lru_cache(maxsize=8)
-def _get_mdx_maps_cached(dict_id: int, mdx_path: str) -> tuple[dict[str, list[bytes]], dict[str, str]]:
+# Unbounded: rebuilding a large index costs seconds, so every installed
+# dictionary keeps its maps until clear_dictionary_caches() drops them.
+# Keyed by dict_id and holding only the current (path, mtime), so dropping
+# one dictionary leaves every other dictionary's index in place.
+_mdx_maps: dict[int, tuple[tuple[str, int], tuple[dict[str, list[bytes]], dict[str, str]]]] = {}
+_mdx_casefold: dict[int, tuple[tuple[str, int], dict[str, str]]] = {}
+
+# MDD maps hold every packed asset, so only the most recently used are kept.
+_MDD_CACHE_MAX = 32
+_mdd_maps: OrderedDict[tuple[int, str], dict[str, bytes]] = OrderedDict()
+_mdd_maps_lock = threading.Lock()
+
+
+def _get_mdx_maps_cached(
+    dict_id: int, mdx_path: str, mtime: int
+) -> tuple[dict[str, list[bytes]], dict[str, str]]:
+    version = (mdx_path, mtime)
+    hit = _mdx_maps.get(dict_id)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    maps = _build_mdx_maps(dict_id, mdx_path, mtime)
+    _mdx_maps[dict_id] = (version, maps)
+    return maps
+
+
+def _build_mdx_maps(
+    dict_id: int, mdx_path: str, mtime: int
+) -> tuple[dict[str, list[bytes]], dict[str, str]]:
     """Build lookup maps for an MDX file.
 
     Returns:
       - exact_map: headword -> list[bytes]   (Bug fix (2): keep *all* records for a key)
-      - casefold_map: casefold(headword) -> a representative headword
+      - link_map: redirect headword -> the headword its @@@LINK chain ends at
+
+    The case-insensitive map is only needed when an exact lookup misses, so it
+    is built separately by _get_mdx_casefold_cached.
 
     Why we build maps instead of calling mdx.lookup() every time:
       - mdx.lookup() is convenient but repeated calls are slower.
       - keeping our own map also lets us handle the "multiple values per key" bug.
     """
+    index_path = _index_path(dict_id, mtime)
+    maps = _load_index(index_path)
+    if maps is not None:
+        return maps
+
     mdx = MDX(mdx_path)
     exact: dict[str, list[bytes]] = {}
-    casefold_map: dict[str, str] = {}
+    # This loop runs once per record, so hot callables are bound to locals and
+    # the first record of a key no longer allocates a throwaway setdefault list.
+    exact_get, intern, decode = exact.get, sys.intern, _safe_decode
 
     for k, v in mdx.items():
-        ks = _safe_decode(k)
+        # Interned so redirect targets (also interned) share the key object and
+        # dict hits on them short-circuit on identity.
+        ks = intern(decode(k))
 
         # Bug fix (2): store every record under the same key.
-        exact.setdefault(ks, []).append(v)
+        vals = exact_get(ks)
+        if vals is None:
+            exact[ks] = [v]
+        else:
+            vals.append(v)
+
+    maps = exact, _build_link_map(exact)
+    _save_index(dict_id, index_path, maps)
+    return maps
+
+
+# ----------------------------
+# On-disk MDX index
+# - building an index decompresses the whole MDX, so the maps are pickled
+#   and a restarted server loads them instead of rebuilding
+# - lives outside every dictionary folder, so an uploaded ZIP cannot plant one
+# ----------------------------
+def _index_dir() -> Path:
+    return settings.DICT_ROOT / ".idx"
+
+
+def _index_path(dict_id: int, mtime: int) -> Path:
+    return _index_dir() / f"{dict_id}-{mtime}.pickle"
 
-        cf = ks.casefold()
-        # keep first seen representative (stable)
-        if cf not in casefold_map:
-            casefold_map[cf] = ks
 
-    return exact, casefold_map
+def _load_index(path: Path) -> tuple[dict[str, list[bytes]], dict[str, str]] | None:
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Missing, truncated or from an incompatible version; rebuild it.
+        return None
+
+
+def _save_index(dict_id: int, path: Path, maps: tuple[dict[str, list[bytes]], dict[str, str]]) -> None:
+    """Write the maps atomically and drop indexes of older versions of the file."""
+    _remove_indexes(dict_id)
+    # Unique per process and thread: concurrent builders of the same index
+    # must not truncate each other's half-written file before os.replace.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(maps, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        # The index is only an optimization; a read-only disk just means
+        # rebuilding it after each restart.
+        tmp.unlink(missing_ok=True)
+
+
+def _remove_indexes(dict_id: int) -> None:
+    for old in _index_dir().glob(f"{dict_id}-*.pickle"):
+        old.unlink(missing_ok=True)
+
+
+def _get_mdx_casefold_cached(dict_id: int, mdx_path: str, mtime: int) -> dict[str, str]:
+    """Map casefold(headword) -> a representative headword, built on first miss."""
+    version = (mdx_path, mtime)
+    hit = _mdx_casefold.get(dict_id)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    exact, _link_map = _get_mdx_maps_cached(dict_id, mdx_path, mtime)
+    casefold_map = _build_casefold_map(exact)
+    _mdx_casefold[dict_id] = (version, casefold_map)
+    return casefold_map
+
+
+def _build_casefold_map(exact: dict[str, list[bytes]]) -> dict[str, str]:
+    casefold_map: dict[str, str] = {}
+    # setdefault keeps the first seen representative (stable).
+    keep_first = casefold_map.setdefault
+    for ks in exact:
+        # For ASCII, lower() gives the same result as the slower casefold().
+        keep_first(ks.lower() if ks.isascii() else ks.casefold(), ks)
+    return casefold_map
+
+
+def _build_link_map(exact: dict[str, list[bytes]]) -> dict[str, str]:
+    """Resolve every single-record @@@LINK chain once, at index-build time.
+
+    Only chains that end at a real entry are stored; keys with several records,
+    broken links and cycles are left to MdxService._resolve_mdx_link.
+    """
+    link_map: dict[str, str] = {}
+    for head, vals in exact.items():
+        if len(vals) != 1:
+            continue
+        target = _link_target(vals[0])
+        if not target:
+            continue
+        seen = {head}
+        for _ in range(10):  # max depth, as in _resolve_mdx_link
+            if target in seen or target not in exact:
+                break
+            seen.add(target)
+            next_target = _link_target(exact[target][0])
+            if not next_target:
+                link_map[head] = target
+                break
+            target = next_target
+    return link_map
+
+
+def clear_dictionary_caches(dict_id: int) -> None:
+    """Drop one dictionary's cached MDX and MDD maps and its on-disk index.
+
+    Called when a dictionary is removed so its maps do not outlive it; every
+    other dictionary keeps its index. The dictionary list is invalidated so
+    this worker stops listing it at once. The file-inventory LRU is keyed by
+    the install folder and rendered entries by the record bytes, so neither
+    can serve stale data for a later install; their leftovers just age out.
+    """
+    _remove_indexes(dict_id)
+    invalidate_dict_list()
+    _mdx_maps.pop(dict_id, None)
+    _mdx_casefold.pop(dict_id, None)
+    with _mdd_maps_lock:
+        for key in [k for k in _mdd_maps if k[0] == dict_id]:
+            del _mdd_maps[key]
+
+
+@lru_cache(maxsize=4096)
+def _render_entry_cached(dict_id: int, record: bytes) -> str:
+    """Decode and rewrite one entry record.
+
+    History and Vocabulary pages re-render the same headwords over and over.
+    bytes cache their own hash and records come from the cached MDX maps, so
+    a hit costs a dict probe that matches on identity.
+    """
+    return rewrite_mdx_html(dict_id, _safe_decode(record))
+
+
+@lru_cache(maxsize=64)
+def _get_dict_files_cached(dict_id: int, base_dir: str) -> tuple[tuple[Path, ...], tuple[Path, ...]]:
+    """Find a dictionary's *.mdd and extracted *.css files.
+
+    An installed folder never changes, so it is walked once instead of on
+    every CSS or asset request.
+    """
+    root = Path(base_dir)
+    return tuple(root.rglob("*.mdd")), tuple(root.rglob("*.css"))
 
 
-@lru_cache(maxsize=32)
 def _get_mdd_map_cached(dict_id: int, mdd_path: str) -> dict[str, bytes]:
+    key = (dict_id, mdd_path)
+    with _mdd_maps_lock:
+        out = _mdd_maps.get(key)
+        if out is not None:
+            _mdd_maps.move_to_end(key)
+            return out
+    out = _build_mdd_map(mdd_path)
+    with _mdd_maps_lock:
+        _mdd_maps[key] = out
+        _mdd_maps.move_to_end(key)
+        if len(_mdd_maps) > _MDD_CACHE_MAX:
+            _mdd_maps.popitem(last=False)
+    return out
+
+
+def _build_mdd_map(mdd_path: str) -> dict[str, bytes]:
     """
     Build an index of packed assets in MDD:
       normalized_key (no leading '/', forward slashes) -> bytes
@@ -315,9 +535,46 @@ def _get_mdd_map_cached(dict_id: int, mdd_path: str) -> dict[str, bytes]:
     return out
 
 
+_LINK_MARKER = b"@@@LINK="
+
+
+def _link_target(record) -> str | None:
+    """Return the target of an '@@@LINK=target' redirect record, or None.
+
+    Redirects are tiny records that open with the marker, so ordinary entries
+    are rejected by a byte search over their first few bytes instead of being
+    decoded and regex-scanned in full.
+    """
+    marker, newline = (_LINK_MARKER, b"\n") if isinstance(record, bytes) else ("@@@LINK=", "\n")
+    pos = record.find(marker, 0, 64)
+    if pos < 0:
+        return None
+    start = pos + len(marker)
+    end = record.find(newline, start)
+    return sys.intern(_safe_decode(record[start:end if end >= 0 else None]).strip())
+
+
+def _mime_for(name: str) -> str:
+    return _mime_for_ext(os.path.splitext(name)[1])
+
+
+@lru_cache(maxsize=128)
+def _mime_for_ext(ext: str) -> str:
+    """MIME type by extension; dictionaries reuse a handful of them."""
+    return mimetypes.guess_type("asset" + ext)[0] or "application/octet-stream"
+
+
 def _safe_decode(b) -> str:
     if isinstance(b, str):
         return b
+    # Most keys are plain ASCII, and BOM-marked text names its own encoding;
+    # neither needs to go through the try/except ladder below.
+    if b.isascii():
+        return b.decode("ascii")
+    if b[:3] == b"\xef\xbb\xbf":
+        return b[3:].decode("utf-8", errors="replace")
+    if b[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return b.decode("utf-16", errors="replace")
     # Chinese dictionaries commonly need big5/cp950
     for enc in ("utf-8", "utf-16", "gb18030", "big5", "cp950", "latin-1"):
         try:
@@ -334,46 +591,71 @@ def _safe_decode(b) -> str:
 # - fixes file:// paths
 # ----------------------------
 _ATTR_RE = re.compile(r'''(?P<attr>src|href)=(?P<q>["'])(?P<url>.*?)(?P=q)''', re.IGNORECASE)
+# Every scheme rewrite_mdx_html treats specially, matched in one step.
+_SCHEME_RE = re.compile(r"https?://|data:|sound://|entry://|bword://|file://", re.IGNORECASE)
 
 
 def rewrite_mdx_html(dict_id: int, html: str) -> str:
-    def repl(m):
-        attr, q, url = m.group("attr"), m.group("q"), m.group("url").strip()
+    # Text-only entries carry no src/href at all. Lowering once and testing for
+    # substrings is many times cheaper than letting the regex scan the entry.
+    lowered = html.lower()
+    if "src=" not in lowered and "href=" not in lowered:
+        return html
+
+    # Formatted once per entry rather than once per rewritten attribute.
+    asset_prefix = f"/dict_asset/{dict_id}/"
+    entry_prefix = f"/dictionary/entry?dict_id={dict_id}&q="
+
+    # Untouched attributes stay inside the copied slices; only rewritten ones
+    # are spliced in, and an entry with nothing to rewrite is returned as is.
+    parts: list[str] = []
+    pos = 0
+    for m in _ATTR_RE.finditer(html):
+        attr, q, url = m.group("attr", "q", "url")
+        url = url.strip()
 
         if not url:
-            return m.group(0)
+            continue
+
+        sm = _SCHEME_RE.match(url)
+        scheme = sm.group(0).lower() if sm else ""
 
         # If it is already a normal web URL or embedded data, keep it
-        if url.startswith(("http://", "https://", "data:")):
-            return m.group(0)
+        if scheme in ("http://", "https://", "data:"):
+            continue
 
         # Handle sound:// which browsers cannot open directly
-        if url.lower().startswith("sound://"):
-            rel = url.split("sound://", 1)[1].lstrip("/").replace("\\", "/")
-            return f'{attr}={q}/dict_asset/{dict_id}/{rel}{q}'
+        if scheme == "sound://":
+            rel = url[sm.end():].lstrip("/").replace("\\", "/")
+            new_url = asset_prefix + rel
 
         # Internal entry links: entry://word, bword://word
-        if url.lower().startswith(("entry://", "bword://")):
-            target = url.split("://", 1)[1]
-            target = target.strip()
+        elif scheme in ("entry://", "bword://"):
+            target = url[sm.end():].strip()
             # route below will render entry in dictionary page
-            return f'{attr}={q}/dictionary/entry?dict_id={dict_id}&q={quote(target)}{q}'
+            new_url = entry_prefix + quote(target)
 
-        # file:// references (common for css/img)
-        url_norm = url
-        if url_norm.startswith(("file:///", "file://")):
-            url_norm = url_norm.split("file://", 1)[-1].lstrip("/")
+        else:
+            # file:// references (common for css/img)
+            url_norm = url[sm.end():].lstrip("/") if scheme == "file://" else url
 
-        # normalize slashes, strip query/fragment, strip leading ./ and /
-        url_norm = url_norm.replace("\\", "/")
-        url_norm = url_norm.split("?", 1)[0].split("#", 1)[0]
-        if url_norm.startswith("./"):
-            url_norm = url_norm[2:]
-        url_norm = url_norm.lstrip("/")
+            # normalize slashes, strip query/fragment, strip leading ./ and /
+            url_norm = url_norm.replace("\\", "/")
+            url_norm = url_norm.split("?", 1)[0].split("#", 1)[0]
+            if url_norm.startswith("./"):
+                url_norm = url_norm[2:]
+            url_norm = url_norm.lstrip("/")
+
+            if not url_norm or url_norm.startswith("#"):
+                continue
 
-        if not url_norm or url_norm.startswith("#"):
-            return m.group(0)
+            new_url = asset_prefix + url_norm
 
-        return f'{attr}={q}/dict_asset/{dict_id}/{url_norm}{q}'
+        parts.append(html[pos:m.start()])
+        parts.append(f"{attr}={q}{new_url}{q}")
+        pos = m.end()
 
-    return _ATTR_RE.sub(repl, html)
+    if not parts:
+        return html
+    parts.append(html[pos:])
+    return "".join(parts)
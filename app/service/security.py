@@ -1,20 +1,29 @@
 from __future__ import annotations
-import hashlib, hmac, os
+import hashlib, hmac, os, re
 
-def hash_password(password: str, iterations: int = 200_000) -> str:
+try:
+    # Optional: same signature as hashlib's, with a faster inner HMAC loop.
+    from fastpbkdf2 import pbkdf2_hmac as _pbkdf2_hmac
+except Exception:  # pragma: no cover
+    _pbkdf2_hmac = hashlib.pbkdf2_hmac
+
+_DEFAULT_ITERATIONS = 200_000
+# The exact shape hash_password writes: scheme, iterations, 16-byte salt, 32-byte digest.
+_STORED_RE = re.compile(r"pbkdf2_sha256\$([1-9][0-9]*)\$([0-9a-f]{32})\$([0-9a-f]{64})")
+
+def hash_password(password: str, iterations: int = _DEFAULT_ITERATIONS) -> str:
     salt = os.urandom(16)
-    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    digest = _pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
     return f"pbkdf2_sha256${iterations}${salt.hex()}${digest.hex()}"
 
 def verify_password(password: str, stored: str) -> bool:
-    try:
-        scheme, iterations_s, salt_hex, digest_hex = stored.split("$", 3)
-        if scheme != "pbkdf2_sha256":
-            return False
-        iterations = int(iterations_s)
-        salt = bytes.fromhex(salt_hex)
-        expected = bytes.fromhex(digest_hex)
-    except Exception:
-        return False
-    actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
-    return hmac.compare_digest(actual, expected)
+    # A malformed or unknown record still pays for a full derivation, so a
+    # failed check takes as long as a real one (pass "" for a missing user).
+    m = _STORED_RE.fullmatch(stored)
+    valid = m is not None
+    if valid:
+        iterations, salt, expected = int(m[1]), bytes.fromhex(m[2]), bytes.fromhex(m[3])
+    else:
+        iterations, salt, expected = _DEFAULT_ITERATIONS, bytes(16), bytes(32)
+    actual = _pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return hmac.compare_digest(actual, expected) and valid
@@ -1,11 +1,66 @@
 from __future__ import annotations
 
+import math
+import threading
+import time
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from app.data.vocab_repo import VocabRepo
 from app.models.vocab import Favourite, HistoryItem
 
 
+# Epoch seconds the timestamp filter can render (datetime years 1..9999).
+_MIN_TIMESTAMP = int(datetime.min.replace(tzinfo=timezone.utc).timestamp())
+_MAX_TIMESTAMP = int(datetime.max.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _parse_created_at(value: object) -> int | None:
+    """Accept epoch seconds or an ISO-8601 string (older exports); None if unusable."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, float):
+        # json.loads accepts NaN and Infinity, which int() rejects.
+        if not math.isfinite(value):
+            return None
+        value = int(value)
+    if isinstance(value, int):
+        # Anything datetime cannot represent would break every later render.
+        return value if _MIN_TIMESTAMP <= value <= _MAX_TIMESTAMP else None
+    if isinstance(value, str) and value.strip():
+        value = value.strip()
+        # isdecimal, not isdigit: int() rejects digits such as superscripts.
+        if value.isdecimal():
+            return _parse_created_at(int(value))
+        try:
+            dt = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return _parse_created_at(int(dt.timestamp()))
+    return None
+
+
+# A reload or re-submit of the same search should not record another row.
+_HISTORY_REPEAT_WINDOW = 5.0
+# user_id -> (monotonic time, dict_id, headword) of that user's last recorded lookup
+_last_history: dict[int, tuple[float, int, str]] = {}
+_last_history_lock = threading.Lock()
+
+
+def _validate_favourite(headword: str, notes: str, mastery: int) -> tuple[str, str]:
+    """Return the stripped (headword, notes) or raise ValueError."""
+    headword = headword.strip()
+    if not headword:
+        raise ValueError("Headword cannot be empty.")
+    if not (1 <= mastery <= 5):
+        raise ValueError('Mastery must be 1..5.')
+    if len(notes) > 2000:
+        raise ValueError("Notes too long (max 2000).")
+    return headword, notes.strip()
+
+
 class VocabService:
     """Service layer for favourites + history.
 
@@ -18,18 +73,12 @@ class VocabService:
     # -------------------------
     # Favourites (global vocab)
     # -------------------------
-    def add_or_update_favourite(self, user_id: int, headword: str, notes: str, mastery: int = 1, created_at: str | None = None) -> None:
-        headword = headword.strip()
-        if not headword:
-            raise ValueError("Headword cannot be empty.")
-        if not (1 <= mastery <= 5):
-            raise ValueError('Mastery must be 1..5.')
-        if len(notes) > 2000:
-            raise ValueError("Notes too long (max 2000).")
-        self.repo.upsert_favourite(user_id, headword, notes.strip(), mastery, created_at=created_at)
+    def add_or_update_favourite(self, user_id: int, headword: str, notes: str, mastery: int = 1, created_at: int | None = None) -> None:
+        headword, notes = _validate_favourite(headword, notes, mastery)
+        self.repo.upsert_favourite(user_id, headword, notes, mastery, created_at=created_at)
 
-    def list_favourites(self, user_id: int) -> List[Favourite]:
-        return self.repo.list_favourites(user_id)
+    def list_favourites(self, user_id: int, limit: int | None = None, offset: int = 0) -> List[Favourite]:
+        return self.repo.list_favourites(user_id, limit, offset)
 
     def get_favourite(self, fav_id: int, user_id: int) -> Optional[Favourite]:
         return self.repo.get_favourite(fav_id, user_id)
@@ -60,32 +109,50 @@ class VocabService:
 
         Expected items: [{"word": "...", "notes": "..."}]
         Existing words have their notes overwritten.
+        Every item is validated first, so a bad item imports nothing; the rest
+        are written in a single transaction.
         """
-        count = 0
+        rows = []
         for it in items:
             word = str(it.get("word", "")).strip()
             notes = str(it.get("notes", "")).strip()
             mastery = int(it.get("mastery", 1) or 1)
-            created_at = it.get("created_at")
+            created_at = _parse_created_at(it.get("created_at"))
             if not word:
                 continue
-            self.add_or_update_favourite(user_id=user_id, headword=word, notes=notes, mastery=mastery, created_at=created_at)
-            count += 1
-        return count
+            word, notes = _validate_favourite(word, notes, mastery)
+            rows.append((user_id, word, notes, mastery, created_at))
+        self.repo.upsert_favourites(rows)
+        return len(rows)
 
     # -------------
     # History
     # -------------
     def add_history(self, user_id: int, dict_id: int, headword: str) -> None:
         headword = headword.strip()
-        if headword:
-            self.repo.add_history(user_id, dict_id, headword)
+        if not headword:
+            return
+        now = time.monotonic()
+        with _last_history_lock:
+            last = _last_history.get(user_id)
+            if last is not None and last[1:] == (dict_id, headword) and now - last[0] < _HISTORY_REPEAT_WINDOW:
+                return
+            _last_history[user_id] = (now, dict_id, headword)
+            if len(_last_history) > 1024:
+                for uid in [u for u, (t, _, _) in _last_history.items() if now - t >= _HISTORY_REPEAT_WINDOW]:
+                    del _last_history[uid]
+        self.repo.add_history(user_id, dict_id, headword)
 
     def list_history(self, user_id: int, limit: int = 200) -> List[HistoryItem]:
         return self.repo.list_history(user_id, limit)
 
     def delete_history_item(self, item_id: int, user_id: int) -> None:
+        # The deleted row may be the one the repeat window is suppressing.
+        with _last_history_lock:
+            _last_history.pop(user_id, None)
         self.repo.delete_history_item(item_id, user_id)
 
     def clear_history(self, user_id: int) -> None:
+        with _last_history_lock:
+            _last_history.pop(user_id, None)
         self.repo.clear_history(user_id)
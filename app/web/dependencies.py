@@ -1,4 +1,7 @@
 from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 from fastapi import Request
 from app.config import settings
@@ -9,14 +12,57 @@ from app.models.user import User
 session_repo = SessionRepo()
 user_repo = UserRepo()
 
+# Almost every request resolves its session cookie, so the answer is kept
+# briefly per token instead of costing two queries each time. Routers that
+# end a session or change a user evict it here; the short TTL bounds how long
+# another worker process can keep serving a stale entry.
+_USER_CACHE_TTL = 10.0
+_USER_CACHE_MAX = 4096
+_user_cache: OrderedDict[str, tuple[float, User]] = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+_UNSET = object()
+
 def get_current_user(request: Request) -> Optional[User]:
+    # Memoized on the request, so helpers that ask again within the same
+    # request do not repeat the lookup.
+    user = getattr(request.state, "current_user", _UNSET)
+    if user is _UNSET:
+        user = request.state.current_user = _resolve_user(request)
+    return user
+
+def _resolve_user(request: Request) -> Optional[User]:
     token = request.cookies.get(settings.SESSION_COOKIE_NAME)
     if not token:
         return None
+    now = time.monotonic()
+    with _user_cache_lock:
+        hit = _user_cache.get(token)
+        if hit is not None and hit[0] > now:
+            _user_cache.move_to_end(token)
+            return hit[1]
     user_id = session_repo.get_user_id_by_token(token)
     if user_id is None:
         return None
-    return user_repo.get_user_by_id(user_id)
+    user = user_repo.get_user_by_id(user_id)
+    if user is not None:
+        with _user_cache_lock:
+            _user_cache[token] = (now + _USER_CACHE_TTL, user)
+            _user_cache.move_to_end(token)
+            if len(_user_cache) > _USER_CACHE_MAX:
+                _user_cache.popitem(last=False)
+    return user
+
+def forget_session(token: str) -> None:
+    """Evict one session token, e.g. on logout."""
+    with _user_cache_lock:
+        _user_cache.pop(token, None)
+
+def forget_user(user_id: int) -> None:
+    """Evict every cached session of a user that was changed or deleted."""
+    with _user_cache_lock:
+        for token in [t for t, (_, u) in _user_cache.items() if u.id == user_id]:
+            del _user_cache[token]
 
 def is_admin(user: Optional[User]) -> bool:
     return bool(user and user.is_admin)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+
+
+def format_timestamp(ts: int | None) -> str:
+    """Jinja filter: render a unix-epoch ``created_at`` for display."""
+    if ts is None:
+        return ""
+    try:
+        return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    except (ValueError, OverflowError, OSError, TypeError):
+        # Rows migrated from TEXT may hold values no datetime can represent;
+        # show them as-is rather than failing the whole page.
+        return str(ts)
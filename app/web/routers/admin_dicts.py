@@ -1,14 +1,14 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request, Form, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from app.web.dependencies import get_current_user, is_admin
 from app.data.dict_repo import DictRepo
 from app.service.dict_install_service import DictInstallService, DictInstallError
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 
 dict_repo = DictRepo()
 install_service = DictInstallService(dict_repo)
@@ -34,8 +34,9 @@ async def upload_dict(request: Request, name: str = Form(...), zip_file: UploadF
     if redirect:
         return redirect
     try:
-        data = await zip_file.read()
-        install_service.install_from_zip_bytes(name, data)
+        # UploadFile is already spooled to disk past a small size; extract from
+        # it directly, and off the event loop since extraction is blocking work.
+        await run_in_threadpool(install_service.install_from_file, name, zip_file.file)
         return RedirectResponse(url="/admin/dicts", status_code=303)
     except DictInstallError as e:
         return templates.TemplateResponse("admin_dicts.html", {"request": request, "user": user, "dicts": dict_repo.list_dicts(), "error": str(e)}, status_code=400)
@@ -3,14 +3,13 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
-from app.web.dependencies import get_current_user, is_admin
+from app.web.dependencies import forget_user, get_current_user, is_admin
 from app.data.user_repo import UserRepo
 from app.service.user_service import UserService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 
 user_service = UserService(UserRepo())
 
@@ -42,5 +41,6 @@ def admin_delete_user(request: Request, user_id: int):
 
     # Allow deleting any user (including self). If you delete yourself, your session will be invalid.
     user_service.admin_delete_user(target_user_id=user_id)
+    forget_user(user_id)
 
     return RedirectResponse(url="/admin/users", status_code=303)
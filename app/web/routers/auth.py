@@ -1,15 +1,15 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from app.config import settings
 from app.data.user_repo import UserRepo
 from app.data.session_repo import SessionRepo
 from app.service.auth_service import AuthService, AuthError
+from app.web.dependencies import forget_session
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 auth_service = AuthService(UserRepo(), SessionRepo())
 
 @router.get("/register", response_class=HTMLResponse)
@@ -45,6 +45,7 @@ def logout(request: Request):
     token = request.cookies.get(settings.SESSION_COOKIE_NAME)
     if token:
         auth_service.logout(token)
+        forget_session(token)
     resp = RedirectResponse(url="/", status_code=303)
     resp.delete_cookie(settings.SESSION_COOKIE_NAME)
     return resp
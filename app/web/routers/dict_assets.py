@@ -1,5 +1,8 @@
 from __future__ import annotations
-from fastapi import APIRouter
+import gzip
+import hashlib
+from functools import lru_cache
+from fastapi import APIRouter, Request
 from fastapi.responses import Response
 
 from app.data.dict_repo import DictRepo
@@ -10,8 +13,51 @@ mdx_service = MdxService(DictRepo())
 
 _CSS_OVERRIDE = '\n/* WebDict override: allow selecting/copying text inside dictionary definition area.\n   Many MDX dictionaries ship CSS that disables selection for IPA/pronunciation spans. */\n.definition, .definition * {\n  -webkit-user-select: text !important;\n  user-select: text !important;\n  -webkit-touch-callout: default !important;\n}\n'.encode("utf-8")
 
+# An installed dictionary never changes, so its CSS can be cached by browsers
+# for a week and revalidated by ETag after that.
+_CSS_CACHE_CONTROL = "public, max-age=604800"
+_ASSET_CACHE_CONTROL = "public, max-age=86400"
+
+def _asset_etag(folder: str, asset_path: str) -> str:
+    # An installed folder is never modified and its name carries the install
+    # timestamp, so (folder, path) identifies the bytes even when SQLite
+    # reuses a deleted dictionary's id; a revalidation can be answered
+    # without looking the asset up at all.
+    return f'"{hashlib.blake2b(f"{folder}/{asset_path}".encode(), digest_size=16).hexdigest()}"'
+
+@lru_cache(maxsize=256)
+def _css_variants(dict_id: int, folder: str, asset_path: str) -> tuple[bytes, str, bytes, str]:
+    """(plain, etag, gzipped, gzip etag) for a CSS asset with our override appended.
+
+    Keyed by the install folder too, so a reinstall that reuses the id never
+    hits the entries of the dictionary it replaced.
+    """
+    data, _mime = mdx_service.get_asset_bytes(dict_id, asset_path)
+    if not data.endswith(b"\n"):
+        data += b"\n"
+    data += _CSS_OVERRIDE
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return data, f'"{digest}"', gzip.compress(data, compresslevel=6), f'"{digest}-gz"'
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding lists gzip with a non-zero q-value."""
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        return q > 0
+    return False
+
 @router.get("/dict_asset/{dict_id}/{asset_path:path}")
-def get_asset(dict_id: int, asset_path: str):
+def get_asset(request: Request, dict_id: int, asset_path: str):
     """Serve assets referenced by MDX HTML.
 
     Bug fix:
@@ -23,15 +69,30 @@ def get_asset(dict_id: int, asset_path: str):
       This keeps dictionary styling but re-enables selection/copy for text.
     """
     try:
-        data, mime = mdx_service.get_asset_bytes(dict_id, asset_path)
+        # A deleted dictionary must stop resolving before any cache is consulted.
+        d = mdx_service.get_dict(dict_id)
+        if not d:
+            raise DictLookupError("Dictionary not found.")
 
         # If this is a CSS file, append our override at the end so it wins in the cascade.
-        if asset_path.lower().endswith(".css") or (mime and mime.startswith("text/css")):
-            if not data.endswith(b"\n"):
-                data += b"\n"
-            data += _CSS_OVERRIDE
-            mime = "text/css"
+        if asset_path.lower().endswith(".css"):
+            plain, etag, gzipped, gzip_etag = _css_variants(dict_id, d.folder, asset_path)
+            use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+            if use_gzip:
+                etag = gzip_etag
+            headers = {"ETag": etag, "Cache-Control": _CSS_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
+                return Response(content=gzipped, media_type="text/css", headers=headers)
+            return Response(content=plain, media_type="text/css", headers=headers)
 
-        return Response(content=data, media_type=mime)
+        etag = _asset_etag(d.folder, asset_path)
+        headers = {"ETag": etag, "Cache-Control": _ASSET_CACHE_CONTROL}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        data, mime = mdx_service.get_asset_bytes(dict_id, asset_path)
+        return Response(content=data, media_type=mime, headers=headers)
     except DictLookupError as e:
         return Response(content=str(e), media_type="text/plain", status_code=404)
@@ -1,16 +1,16 @@
 from __future__ import annotations
+from urllib.parse import urlencode
 from fastapi import APIRouter, Request, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from app.web.dependencies import get_current_user
 from app.data.dict_repo import DictRepo
 from app.data.vocab_repo import VocabRepo
 from app.service.mdx_service import MdxService, DictLookupError
 from app.service.vocab_service import VocabService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 
 mdx_service = MdxService(DictRepo())
 vocab_service = VocabService(VocabRepo())
@@ -23,6 +23,11 @@ def _require_user(request: Request):
     return user, None
 
 
+def _dict_redirect_url(dict_id: int, headword: str) -> str:
+    # Headwords may contain spaces, "&" or "#", so they must be query-encoded.
+    return "/dictionary?" + urlencode({"dict_id": dict_id, "query": headword})
+
+
 def _dict_css_url(dict_id: int | None) -> str | None:
     if dict_id is None:
         return None
@@ -193,7 +198,7 @@ def dictionary_favourite(
         mastery=mastery_int,
     )
 
-    return RedirectResponse(url=f"/dictionary?dict_id={dict_id}&query={headword}", status_code=303)
+    return RedirectResponse(url=_dict_redirect_url(dict_id, headword), status_code=303)
 
 
 @router.post("/dictionary/mastery_inc")
@@ -205,7 +210,7 @@ def dictionary_mastery_inc(request: Request, fav_id: int = Form(...), dict_id: i
     if fav:
         new_level = min(5, int(fav.mastery) + 1)
         vocab_service.update_mastery(fav_id=fav_id, user_id=user.id, mastery=new_level)
-    return RedirectResponse(url=f"/dictionary?dict_id={dict_id}&query={headword}", status_code=303)
+    return RedirectResponse(url=_dict_redirect_url(dict_id, headword), status_code=303)
 
 
 @router.post("/dictionary/mastery_dec")
@@ -217,7 +222,9 @@ def dictionary_mastery_dec(request: Request, fav_id: int = Form(...), dict_id: i
     if fav:
         new_level = max(1, int(fav.mastery) - 1)
         vocab_service.update_mastery(fav_id=fav_id, user_id=user.id, mastery=new_level)
-    return RedirectResponse(url=f"/dictionary?dict_id={dict_id}&query={headword}", status_code=303)
+    return RedirectResponse(url=_dict_redirect_url(dict_id, headword), status_code=303)
+
+
 @router.post("/dictionary/unfavourite")
 def dictionary_unfavourite(
     request: Request,
@@ -231,4 +238,4 @@ def dictionary_unfavourite(
         return redirect
 
     vocab_service.delete_favourite(fav_id=fav_id, user_id=user.id)
-    return RedirectResponse(url=f"/dictionary?dict_id={dict_id}&query={headword}", status_code=303)
+    return RedirectResponse(url=_dict_redirect_url(dict_id, headword), status_code=303)
@@ -1,16 +1,15 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from app.web.dependencies import get_current_user
 from app.data.dict_repo import DictRepo
 from app.data.vocab_repo import VocabRepo
 from app.service.mdx_service import MdxService, DictLookupError
 from app.service.vocab_service import VocabService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 
 dict_repo = DictRepo()
 mdx_service = MdxService(dict_repo)
@@ -39,7 +38,7 @@ def history_home(request: Request, dict_id: int | None = None, item_id: int | No
     if redirect:
         return redirect
 
-    dicts = dict_repo.list_dicts()
+    dicts = mdx_service.list_dicts()
     if dict_id is None and dicts:
         dict_id = dicts[0].id
 
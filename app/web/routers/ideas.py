@@ -1,14 +1,13 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from app.web.dependencies import get_current_user
 from app.data.idea_repo import IdeaRepo
 from app.service.idea_service import IdeaService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 idea_service = IdeaService(IdeaRepo())
 
 def _require_user(request: Request):
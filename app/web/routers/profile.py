@@ -1,14 +1,13 @@
 from __future__ import annotations
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
-from app.web.dependencies import get_current_user
+from app.web.dependencies import forget_user, get_current_user
 from app.data.user_repo import UserRepo
 from app.service.user_service import UserService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 user_service = UserService(UserRepo())
 
 def _require_user(request: Request):
@@ -33,6 +32,7 @@ def update_profile(request: Request, display_name: str = Form(""), bio: str = Fo
         user = user_service.update_profile(user.id, display_name, bio)
     except Exception as e:
         return templates.TemplateResponse("profile.html", {"request": request, "user": user, "error": str(e)}, status_code=400)
+    forget_user(user.id)
     return RedirectResponse(url="/me", status_code=303)
 
 @router.post("/me/username")
@@ -44,6 +44,7 @@ def change_username(request: Request, new_username: str = Form(...)):
         user = user_service.change_username(user.id, new_username)
     except Exception as e:
         return templates.TemplateResponse("profile.html", {"request": request, "user": user, "error": str(e)}, status_code=400)
+    forget_user(user.id)
     return RedirectResponse(url="/me", status_code=303)
 
 @router.post("/me/password")
@@ -88,6 +89,7 @@ def delete_self(request: Request):
 
     # Delete the user row (cascades)
     user_service.delete_self(user_id=user.id)
+    forget_user(user.id)
 
     # Clear cookie so the browser isn't left with a dead session token
     resp = RedirectResponse(url="/", status_code=303)
@@ -1,17 +1,17 @@
 from __future__ import annotations
 import json
+from urllib.parse import urlencode
 from fastapi import APIRouter, Request, Form, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
 
 from app.web.dependencies import get_current_user
 from app.data.dict_repo import DictRepo
 from app.data.vocab_repo import VocabRepo
 from app.service.mdx_service import MdxService, DictLookupError
 from app.service.vocab_service import VocabService
+from app.web.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/web/templates")
 
 dict_repo = DictRepo()
 mdx_service = MdxService(dict_repo)
@@ -25,6 +25,11 @@ def _require_user(request: Request):
     return user, None
 
 
+def _vocab_redirect_url(dict_id: int, fav_id: int, sort_by: str, order: str) -> str:
+    # sort_by and order are free-text form values, so they must be query-encoded.
+    return "/vocab?" + urlencode({"dict_id": dict_id, "fav_id": fav_id, "sort_by": sort_by, "order": order})
+
+
 def _dict_css_url(dict_id: int | None) -> str | None:
     if dict_id is None:
         return None
@@ -46,7 +51,7 @@ def vocab_home(request: Request, dict_id: int | None = None, fav_id: int | None
     if redirect:
         return redirect
 
-    dicts = dict_repo.list_dicts()
+    dicts = mdx_service.list_dicts()
     if dict_id is None and dicts:
         dict_id = dicts[0].id
 
@@ -62,12 +67,13 @@ def vocab_home(request: Request, dict_id: int | None = None, fav_id: int | None
     else:
         favourites = sorted(favourites, key=lambda f: f.headword.casefold(), reverse=rev)
 
-    selected = vocab_service.get_favourite(fav_id, user.id) if fav_id is not None else None
-    if selected is None and word and favourites:
-        for f in favourites:
-            if f.headword == word:
-                selected = f
-                break
+    # The full list is already loaded, so pick the selection from it rather
+    # than querying the favourite again.
+    selected = None
+    if fav_id is not None:
+        selected = next((f for f in favourites if f.id == fav_id), None)
+    if selected is None and word:
+        selected = next((f for f in favourites if f.headword == word), None)
 
     result, err = None, None
     if selected and dict_id:
@@ -153,7 +159,8 @@ async def import_vocab(request: Request, dict_id: int = Form(...), json_file: Up
 
     raw = await json_file.read()
     try:
-        items = json.loads(raw.decode("utf-8"))
+        # json.loads detects the encoding of bytes itself, so skip the decode copy.
+        items = json.loads(raw)
         if not isinstance(items, list):
             raise ValueError("JSON must be a list.")
     except Exception:
@@ -172,7 +179,7 @@ def mastery_inc(request: Request, fav_id: int, dict_id: int = Form(...), sort_by
     if fav:
         new_level = min(5, int(fav.mastery) + 1)
         vocab_service.update_mastery(fav_id=fav_id, user_id=user.id, mastery=new_level)
-    return RedirectResponse(url=f"/vocab?dict_id={dict_id}&fav_id={fav_id}&sort_by={sort_by}&order={order}", status_code=303)
+    return RedirectResponse(url=_vocab_redirect_url(dict_id, fav_id, sort_by, order), status_code=303)
 
 
 @router.post("/vocab/{fav_id}/mastery_dec")
@@ -184,4 +191,4 @@ def mastery_dec(request: Request, fav_id: int, dict_id: int = Form(...), sort_by
     if fav:
         new_level = max(1, int(fav.mastery) - 1)
         vocab_service.update_mastery(fav_id=fav_id, user_id=user.id, mastery=new_level)
-    return RedirectResponse(url=f"/vocab?dict_id={dict_id}&fav_id={fav_id}&sort_by={sort_by}&order={order}", status_code=303)
+    return RedirectResponse(url=_vocab_redirect_url(dict_id, fav_id, sort_by, order), status_code=303)
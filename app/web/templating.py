@@ -0,0 +1,11 @@
+from __future__ import annotations
+from fastapi.templating import Jinja2Templates
+
+from app.web.filters import format_timestamp
+
+# One Jinja environment for every router, so each template is loaded and
+# compiled once per process instead of once per router that renders it.
+templates = Jinja2Templates(directory="app/web/templates")
+templates.env.filters["timestamp"] = format_timestamp
+# Skip the per-render mtime check on the template file; restart to pick up edits.
+templates.env.auto_reload = False